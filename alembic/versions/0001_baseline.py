@@ -0,0 +1,112 @@
+"""Baseline schema (roles, users, api_keys, books, borrows)
+
+Matches what ``Base.metadata.create_all`` produced before migrations were
+introduced. Existing databases created that way should be stamped with
+``alembic stamp 0001`` and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "roles",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(50), nullable=False, unique=True),
+        sa.Column("description", sa.String(255)),
+        sa.Column("permissions", sa.Text(), nullable=False),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("role_id", sa.Integer(), sa.ForeignKey("roles.id"), nullable=False),
+        *_timestamps(),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("key_hash", sa.String(64), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("expires_at", sa.String(50)),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        *_timestamps(),
+    )
+    op.create_index("ix_api_keys_key_hash", "api_keys", ["key_hash"], unique=True)
+
+    op.create_table(
+        "books",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("isbn", sa.String(20), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("author", sa.String(300), nullable=False),
+        sa.Column("publisher", sa.String(300)),
+        sa.Column("genre", sa.String(100)),
+        sa.Column("description", sa.Text()),
+        sa.Column("total_copies", sa.Integer(), nullable=False),
+        sa.Column("available_copies", sa.Integer(), nullable=False),
+        sa.Column("published_year", sa.Integer()),
+        *_timestamps(),
+    )
+    op.create_index("ix_books_isbn", "books", ["isbn"], unique=True)
+
+    op.create_table(
+        "borrows",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("books.id"), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("borrowed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("due_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("returned_at", sa.DateTime(timezone=True)),
+        sa.Column("notes", sa.Text()),
+        *_timestamps(),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("borrows")
+    op.drop_table("books")
+    op.drop_table("api_keys")
+    op.drop_table("users")
+    op.drop_table("roles")
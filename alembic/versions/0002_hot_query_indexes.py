@@ -0,0 +1,48 @@
+"""Indexes for hot queries in borrow_service, book_service and user_service
+
+- borrows (user_id, status): member-scoped listings and exports
+- borrows (book_id, status): per-book circulation lookups
+- borrows (status, due_date): overdue scans over active borrows
+- borrows (due_date), (borrowed_at): keyset sorts and date-range exports
+- books title/author/created_at/genre: keyset sorts and search filters
+- users created_at, role_id; api_keys user_id: listings and FK lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_borrows_user_id_status", "borrows", ["user_id", "status"]),
+    ("ix_borrows_book_id_status", "borrows", ["book_id", "status"]),
+    ("ix_borrows_status_due_date", "borrows", ["status", "due_date"]),
+    ("ix_borrows_due_date", "borrows", ["due_date"]),
+    ("ix_borrows_borrowed_at", "borrows", ["borrowed_at"]),
+    ("ix_books_title", "books", ["title"]),
+    ("ix_books_author", "books", ["author"]),
+    ("ix_books_genre", "books", ["genre"]),
+    ("ix_books_created_at", "books", ["created_at"]),
+    ("ix_users_role_id", "users", ["role_id"]),
+    ("ix_users_created_at", "users", ["created_at"]),
+    ("ix_api_keys_user_id", "api_keys", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
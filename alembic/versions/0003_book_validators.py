@@ -0,0 +1,48 @@
+"""Microsecond books.updated_at and an index for catalog validators
+
+ETag/Last-Modified for the catalog come from max(books.updated_at); the
+index makes that a single index lookup, and DATETIME(6) on MySQL keeps
+changes within the same second distinguishable.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "books",
+            "updated_at",
+            existing_type=mysql.DATETIME(),
+            type_=mysql.DATETIME(fsp=6),
+            existing_nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP(6)"),
+        )
+    op.create_index("ix_books_updated_at", "books", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_updated_at", table_name="books")
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "books",
+            "updated_at",
+            existing_type=mysql.DATETIME(fsp=6),
+            type_=mysql.DATETIME(),
+            existing_nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        )
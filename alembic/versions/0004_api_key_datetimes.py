@@ -0,0 +1,93 @@
+"""api_keys.expires_at as a DATETIME, plus last_used_at
+
+expires_at used to be an ISO string that nothing checked; the resolver now
+compares it on every request. Existing values are parsed and carried over
+(as naive UTC); unparseable ones become NULL. last_used_at is stamped in
+batches by the usage flusher.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+api_keys = sa.table(
+    "api_keys",
+    sa.column("id", sa.Integer()),
+    sa.column("expires_at", sa.String(50)),
+    sa.column("expires_at_dt", sa.DateTime(timezone=True)),
+    sa.column("expires_at_str", sa.String(50)),
+)
+
+
+def _parse(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def upgrade() -> None:
+    op.add_column("api_keys", sa.Column("expires_at_dt", sa.DateTime(timezone=True)))
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(api_keys.c.id, api_keys.c.expires_at).where(
+            api_keys.c.expires_at.is_not(None)
+        )
+    ).all()
+    for key_id, expires_at in rows:
+        conn.execute(
+            api_keys.update()
+            .where(api_keys.c.id == key_id)
+            .values(expires_at_dt=_parse(expires_at))
+        )
+    with op.batch_alter_table("api_keys") as batch:
+        batch.drop_column("expires_at")
+        batch.alter_column(
+            "expires_at_dt",
+            new_column_name="expires_at",
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=True,
+        )
+        batch.add_column(sa.Column("last_used_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    op.add_column("api_keys", sa.Column("expires_at_str", sa.String(50)))
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(api_keys.c.id, api_keys.c.expires_at).where(
+            api_keys.c.expires_at.is_not(None)
+        )
+    ).all()
+    for key_id, expires_at in rows:
+        if isinstance(expires_at, str):  # SQLite hands DATETIME back as text
+            expires_at = datetime.fromisoformat(expires_at)
+        conn.execute(
+            api_keys.update()
+            .where(api_keys.c.id == key_id)
+            .values(expires_at_str=expires_at.isoformat())
+        )
+    with op.batch_alter_table("api_keys") as batch:
+        batch.drop_column("last_used_at")
+        batch.drop_column("expires_at")
+        batch.alter_column(
+            "expires_at_str",
+            new_column_name="expires_at",
+            existing_type=sa.String(50),
+            existing_nullable=True,
+        )
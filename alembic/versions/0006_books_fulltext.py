@@ -0,0 +1,43 @@
+"""FULLTEXT index behind /books/search on MySQL
+
+In its own revision so databases stamped at 0001 get it too. Databases
+whose baseline already created it are left as they are.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME = "ft_books_title_author_description"
+
+
+def _exists() -> bool:
+    if op.get_context().as_sql:
+        return False  # offline (--sql): nothing to inspect; emit the DDL
+    return any(
+        index["name"] == NAME for index in sa.inspect(op.get_bind()).get_indexes("books")
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "mysql" or _exists():
+        return
+    op.create_index(
+        NAME, "books", ["title", "author", "description"], mysql_prefix="FULLTEXT"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql" and _exists():
+        op.drop_index(NAME, table_name="books")
@@ -0,0 +1,27 @@
+"""Drop ix_borrows_due_date
+
+The overdue scan filters on status as well, so it is served by
+ix_borrows_status_due_date; the single-column index only added write cost.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_borrows_due_date", table_name="borrows")
+
+
+def downgrade() -> None:
+    op.create_index("ix_borrows_due_date", "borrows", ["due_date"])
@@ -0,0 +1,31 @@
+import os
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import require_permissions
+from app.core.permissions import Permission
+from app.db.pool import pool_stats
+from app.db.replicas import replica_router
+from app.db.session import engine
+
+router = APIRouter(tags=["admin"])
+
+
+@router.get(
+    "/db-pool",
+    # role:manage is held by the admin role only.
+    dependencies=[Depends(require_permissions([Permission.ROLE_MANAGE]))],
+)
+async def db_pool_stats():
+    """Connection pool state of the worker that serves the request.
+
+    Each worker has its own pools, so repeated calls may land on different
+    workers; ``pid`` tells them apart.
+    """
+    return {
+        "pid": os.getpid(),
+        "primary": pool_stats(engine, "primary"),
+        "replicas": [
+            pool_stats(replica.engine, replica.name) for replica in replica_router.replicas
+        ],
+    }
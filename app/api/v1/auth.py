@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db
-from app.schemas.auth import LoginRequest, RefreshRequest, TokenPair
+from app.core.deps import get_current_active_user, get_db, oauth2_scheme
+from app.core.principal import Principal
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, TokenPair
 from app.services import auth_service
 
 router = APIRouter(tags=["auth"])
@@ -27,5 +30,18 @@ async def login_form(
 
 
 @router.post("/refresh", response_model=TokenPair, status_code=status.HTTP_200_OK)
-async def refresh(payload: RefreshRequest):
-    return await auth_service.refresh(payload)
+async def refresh(
+    payload: RefreshRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    return await auth_service.refresh(db, payload)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    payload: Optional[LogoutRequest] = None,
+    authorization: str | None = Security(oauth2_scheme),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await auth_service.logout(db, current_user, authorization, payload)
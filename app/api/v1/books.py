@@ -1,13 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, require_permissions
+from app.core.deps import get_db, get_read_db, require_permissions
 from app.core.permissions import Permission
+from app.core.serialization import parse_fields
 from app.models import User
-from app.schemas.book import BookCreate, BookOut, BookUpdate
-from app.services import book_service
+from app.schemas.book import BookCreate, BookImportResult, BookOut, BookUpdate
+from app.services import book_service, export_service, import_service, search_service
 
 router = APIRouter(tags=["books"])
 
@@ -18,11 +20,72 @@ router = APIRouter(tags=["books"])
     dependencies=[Depends(require_permissions([Permission.BOOK_READ]))],
 )
 async def list_books(
+    request: Request,
     skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    limit: int = book_service.DEFAULT_PAGE_SIZE,
+    after: str | None = None,
+    sort: str = "id",
+    fields: str | None = Query(
+        None, description="Comma-separated subset of the response fields to return"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    query = book_service.BookListQuery(
+        keyset=book_service.book_keyset(sort),
+        skip=skip,
+        limit=limit,
+        after=after,
+        fields=parse_fields(fields, book_service.BOOK_FIELDS),
+    )
+    return await book_service.list_books_response(db, request, query)
+
+
+@router.get(
+    "/search",
+    response_model=List[BookOut],
+    dependencies=[Depends(require_permissions([Permission.BOOK_READ]))],
+)
+async def search_books(
+    q: str = Query(min_length=1, max_length=200),
+    genre: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    available: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await book_service.list_books(db, skip=skip, limit=limit)
+    filters = search_service.BookSearchFilters(
+        genre=genre, year_from=year_from, year_to=year_to, available_only=available
+    )
+    return await search_service.search_books(db, q, filters, skip=skip, limit=limit)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_permissions([Permission.BOOK_READ]))],
+)
+async def export_books(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    genre: str | None = None,
+):
+    return export_service.export_response(
+        export_service.books_query(genre=genre), format, "books"
+    )
+
+
+@router.get(
+    "/{book_id}",
+    response_model=BookOut,
+    dependencies=[Depends(require_permissions([Permission.BOOK_READ]))],
+)
+async def get_book(
+    book_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await book_service.book_response(db, request, book_id)
 
 
 @router.post(
@@ -38,6 +101,42 @@ async def create_book(
     return await book_service.create_book(db, payload)
 
 
+@router.post(
+    "/import",
+    response_model=BookImportResult,
+    dependencies=[
+        Depends(require_permissions([Permission.BOOK_CREATE, Permission.BOOK_UPDATE]))
+    ],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_books(
+    request: Request,
+    format: str | None = Query(None, pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+):
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            fmt = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            fmt = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send text/csv or application/x-ndjson, or pass ?format=",
+            )
+    return await import_service.import_books(db, request.stream(), fmt)
+
+
 @router.patch(
     "/{book_id}",
     response_model=BookOut,
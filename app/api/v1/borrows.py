@@ -1,13 +1,28 @@
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_active_user, require_permissions
+from app.core.deps import (
+    get_current_active_user,
+    get_db,
+    get_read_db,
+    require_permissions,
+)
+from app.core.pagination import set_next_cursor
 from app.core.permissions import Permission
-from app.models import User
-from app.schemas.borrow import BorrowCreate, BorrowOut
-from app.services import borrow_service
+from app.core.principal import Principal
+from app.core.serialization import parse_fields, rows_to_json
+from app.schemas.borrow import (
+    BatchResult,
+    BorrowBatchCreate,
+    BorrowCreate,
+    BorrowOut,
+    ReturnBatchRequest,
+)
+from app.services import borrow_service, export_service
 
 router = APIRouter(tags=["borrows"])
 
@@ -20,12 +35,38 @@ router = APIRouter(tags=["borrows"])
 )
 async def create_borrow(
     payload: BorrowCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await borrow_service.borrow_book(db, current_user, payload)
 
 
+@router.post(
+    "/batch",
+    response_model=BatchResult,
+    dependencies=[Depends(require_permissions([Permission.BORROW_CREATE]))],
+)
+async def create_borrows_batch(
+    payload: BorrowBatchCreate,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await borrow_service.borrow_books_batch(db, current_user, payload)
+
+
+@router.post(
+    "/returns/batch",
+    response_model=BatchResult,
+    dependencies=[Depends(require_permissions([Permission.BORROW_RETURN]))],
+)
+async def return_borrows_batch(
+    payload: ReturnBatchRequest,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await borrow_service.return_borrows_batch(db, current_user, payload)
+
+
 @router.get(
     "/",
     response_model=List[BorrowOut],
@@ -34,10 +75,51 @@ async def create_borrow(
 async def list_borrows(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    after: str | None = None,
+    sort: str = "id",
+    fields: str | None = Query(
+        None, description="Comma-separated subset of the response fields to return"
+    ),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    keyset = borrow_service.borrow_keyset(sort)
+    selected = parse_fields(fields, borrow_service.BORROW_FIELDS)
+    rows = await borrow_service.list_borrow_rows(
+        db,
+        current_user,
+        skip=skip,
+        limit=limit,
+        after=after,
+        keyset=keyset,
+        fields=selected,
+    )
+    # Serialized here rather than through response_model, which still
+    # documents the shape.
+    response = Response(rows_to_json(rows, selected), media_type="application/json")
+    set_next_cursor(response, rows, keyset, limit)
+    return response
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_permissions([Permission.BORROW_READ]))],
+)
+async def export_borrows(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    borrow_status: str | None = Query(None, alias="status"),
+    borrowed_from: datetime | None = None,
+    borrowed_to: datetime | None = None,
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    return await borrow_service.list_borrows(db, current_user, skip=skip, limit=limit)
+    stmt = export_service.borrows_query(
+        current_user,
+        status=borrow_status,
+        borrowed_from=borrowed_from,
+        borrowed_to=borrowed_to,
+    )
+    return export_service.export_response(stmt, format, "borrows")
 
 
 @router.post(
@@ -47,7 +129,7 @@ async def list_borrows(
 )
 async def return_borrow(
     borrow_id: int,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     return await borrow_service.return_borrow(db, current_user, borrow_id)
@@ -1,12 +1,13 @@
 import json
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, require_permissions
-from app.core.permissions import Permission
-from app.schemas.role import RoleCreate, RoleOut
+from app.core.deps import get_db, get_read_db, require_permissions
+from app.core.pagination import set_next_cursor
+from app.core.permissions import Permission, permissions_to_strings
+from app.schemas.role import RoleCreate, RoleOut, RoleUpdate
 from app.services import role_service
 
 router = APIRouter(tags=["roles"])
@@ -18,11 +19,19 @@ router = APIRouter(tags=["roles"])
     dependencies=[Depends(require_permissions([Permission.ROLE_MANAGE]))],
 )
 async def list_roles(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    after: str | None = None,
+    sort: str = "id",
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await role_service.list_roles(db, skip=skip, limit=limit)
+    keyset = role_service.role_keyset(sort)
+    roles = await role_service.list_roles(
+        db, skip=skip, limit=limit, after=after, keyset=keyset
+    )
+    set_next_cursor(response, roles, keyset, limit)
+    return roles
 
 
 @router.post(
@@ -39,3 +48,28 @@ async def create_role(
     return await role_service.create_role(
         db, payload.name, payload.description, permissions
     )
+
+
+@router.patch(
+    "/{role_id}",
+    response_model=RoleOut,
+    dependencies=[Depends(require_permissions([Permission.ROLE_MANAGE]))],
+)
+async def update_role(
+    role_id: int,
+    payload: RoleUpdate,
+    db: AsyncSession = Depends(get_db),
+):
+    permissions = (
+        json.dumps(permissions_to_strings(payload.permissions))
+        if payload.permissions is not None
+        else None
+    )
+    role = await role_service.update_role(
+        db, role_id, payload.description, permissions
+    )
+    if not role:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role not found"
+        )
+    return role
@@ -1,11 +1,23 @@
-from fastapi import APIRouter
+from fastapi import FastAPI
 
-from app.api.v1 import auth, books, borrows, roles, users
+from app.api.v1 import admin, auth, books, borrows, roles, users
 
-api_router = APIRouter()
+API_PREFIX = "/api/v1"
 
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(books.router, prefix="/books", tags=["books"])
-api_router.include_router(borrows.router, prefix="/borrows", tags=["borrows"])
-api_router.include_router(roles.router, prefix="/roles", tags=["roles"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
+# (router, path under API_PREFIX, tags)
+ROUTERS = [
+    (auth.router, "/auth", ["auth"]),
+    (books.router, "/books", ["books"]),
+    (borrows.router, "/borrows", ["borrows"]),
+    (roles.router, "/roles", ["roles"]),
+    (users.router, "/users", ["users"]),
+    (admin.router, "/admin", ["admin"]),
+]
+
+
+def include_api_routers(app: FastAPI) -> None:
+    # Included into the app directly: include_router() rebuilds every route
+    # (dependency tree, response model validators), so nesting the routers
+    # under an intermediate APIRouter paid for that twice at startup.
+    for router, path, tags in ROUTERS:
+        app.include_router(router, prefix=API_PREFIX + path, tags=tags)
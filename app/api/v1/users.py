@@ -1,14 +1,22 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user, get_db, require_permissions
+from app.core.deps import (
+    get_current_active_user,
+    get_db,
+    get_read_db,
+    require_permissions,
+)
+from app.core.pagination import set_next_cursor
 from app.core.permissions import Permission
-from app.models import User
-from app.schemas.api_key import APIKeyCreate, APIKeyOut
+from app.core.principal import Principal
+from app.core.serialization import parse_fields
+from app.schemas.api_key import APIKeyCreate, APIKeyCreated, APIKeyOut
 from app.schemas.user import UserCreate, UserOut, UserUpdate
-from app.services import api_key_service, user_service
+from app.services import api_key_service, export_service, user_service
 
 router = APIRouter(tags=["users"])
 
@@ -28,7 +36,7 @@ async def register_user(
 
 @router.get("/me", response_model=UserOut)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     return current_user
 
@@ -41,9 +49,39 @@ async def get_current_user_info(
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    after: str | None = None,
+    sort: str = "id",
+    fields: str | None = Query(
+        None, description="Comma-separated subset of the response fields to return"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await user_service.get_all_users(db, skip=skip, limit=limit)
+    keyset = user_service.user_keyset(sort)
+    selected = parse_fields(fields, user_service.USER_FIELDS)
+    rows = await user_service.get_user_rows(
+        db, skip=skip, limit=limit, after=after, keyset=keyset, fields=selected
+    )
+    # Serialized here rather than through response_model, which still
+    # documents the shape.
+    response = Response(
+        user_service.users_to_json(rows, selected), media_type="application/json"
+    )
+    set_next_cursor(response, rows, keyset, limit)
+    return response
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_permissions([Permission.MEMBER_READ]))],
+)
+async def export_users(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    is_active: bool | None = None,
+):
+    return export_service.export_response(
+        export_service.users_query(is_active=is_active), format, "users"
+    )
 
 
 @router.put(
@@ -82,21 +120,19 @@ async def delete_user(
 
 @router.get("/me/api-keys", response_model=List[APIKeyOut])
 async def list_my_api_keys(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await api_key_service.list_user_api_keys(db, current_user.id)
 
 
 @router.post(
-    "/me/api-keys", response_model=APIKeyOut, status_code=status.HTTP_201_CREATED
+    "/me/api-keys", response_model=APIKeyCreated, status_code=status.HTTP_201_CREATED
 )
 async def create_my_api_key(
     payload: APIKeyCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    api_key, raw_key = await api_key_service.create_api_key(
-        db, current_user, payload.name
-    )
-    return api_key
+    api_key, raw_key = await api_key_service.create_api_key(db, current_user, payload)
+    return APIKeyCreated(**APIKeyOut.model_validate(api_key).model_dump(), key=raw_key)
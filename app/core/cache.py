@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from app.core.config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Least recently used entries are evicted once there are more than
+    ``max_entries`` of them or, when ``sizeof`` is given, once their total size
+    exceeds ``max_size``.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        max_size: int = 0,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Optional bound on the summed ``sizeof`` of all values (0 = unbounded).
+        self.max_size = max_size
+        self._sizeof = sizeof
+        self.size = 0
+        self.stats = CacheStats()
+        self._data: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._pop(key)
+        size = self._sizeof(value) if self._sizeof else 0
+        if self.max_size and size > self.max_size:
+            return
+        self._data[key] = (time.monotonic() + ttl, value, size)
+        self.size += size
+        while len(self._data) > self.max_entries or (
+            self.max_size and self.size > self.max_size
+        ):
+            _, (_, _, evicted) = self._data.popitem(last=False)
+            self.size -= evicted
+            self.stats.evictions += 1
+
+    def _pop(self, key: K) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= entry[2]
+        return True
+
+    def delete(self, key: K) -> None:
+        if self._pop(key):
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        if self._data:
+            self.stats.invalidations += len(self._data)
+        self._data.clear()
+        self.size = 0
+
+
+class CacheBackend(ABC):
+    """Async key/value cache interface shared by the in-process and Redis backends."""
+
+    stats: CacheStats
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        max_size: int = 0,
+        sizeof: Callable[[Any], int] | None = None,
+    ) -> None:
+        self._cache: TTLCache[str, Any] = TTLCache(
+            max_entries=max_entries, ttl=ttl, max_size=max_size, sizeof=sizeof
+        )
+        self.stats = self._cache.stats
+
+    async def get(self, key: str) -> Any | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache stored in Redis under ``<namespace>:`` keys.
+
+    Values are serialized with ``dumps``/``loads`` so every worker sees the same
+    entries. Hit/miss counters are tracked per process.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        namespace: str,
+        ttl: float,
+        dumps: Callable[[Any], str | bytes] = json.dumps,
+        loads: Callable[[str | bytes], Any] = json.loads,
+        client: Any = None,
+    ) -> None:
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "CACHE_BACKEND=redis requires the 'redis' package"
+                ) from exc
+            client = aioredis.from_url(url)
+        self._client = client
+        self._prefix = f"{namespace}:"
+        self.ttl = ttl
+        self._dumps = dumps
+        self._loads = loads
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._client.get(self._prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return self._loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        await self._client.set(
+            self._prefix + key, self._dumps(value), px=int(ttl * 1000)
+        )
+
+    async def delete(self, key: str) -> None:
+        if await self._client.delete(self._prefix + key):
+            self.stats.invalidations += 1
+
+    async def clear(self) -> None:
+        keys = [k async for k in self._client.scan_iter(match=self._prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+            self.stats.invalidations += len(keys)
+
+
+def build_cache_backend(
+    namespace: str,
+    max_entries: int,
+    ttl: float,
+    dumps: Callable[[Any], str | bytes] = json.dumps,
+    loads: Callable[[str | bytes], Any] = json.loads,
+    max_size: int = 0,
+    sizeof: Callable[[Any], int] | None = None,
+    client: Any = None,
+) -> CacheBackend:
+    # ``max_size``/``sizeof`` only bound the in-process backend; Redis memory
+    # is governed by its own ``maxmemory`` policy. Passing a Redis ``client``
+    # selects the Redis backend regardless of ``CACHE_BACKEND``.
+    if client is not None or settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(
+            settings.REDIS_URL, namespace, ttl, dumps=dumps, loads=loads, client=client
+        )
+    return MemoryCacheBackend(
+        max_entries=max_entries, ttl=ttl, max_size=max_size, sizeof=sizeof
+    )
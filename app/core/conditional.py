@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass(frozen=True)
+class Validators:
+    """``ETag`` and ``Last-Modified`` for one representation."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def build(
+        cls, *parts: object, last_modified: Optional[datetime] = None, weak: bool = False
+    ) -> "Validators":
+        digest = hashlib.blake2b(
+            "\x1f".join(map(str, parts)).encode(), digest_size=12
+        ).hexdigest()
+        return cls(f'{"W/" if weak else ""}"{digest}"', last_modified)
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "Validators":
+        """Rebuild validators from ``headers`` previously produced by ``headers``."""
+        last_modified = headers.get("Last-Modified")
+        return cls(
+            headers["ETag"],
+            parsedate_to_datetime(last_modified) if last_modified else None,
+        )
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(_as_utc(self.last_modified), usegmt=True)
+        return headers
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def not_modified(self, request: Request) -> bool:
+        """Evaluate ``If-None-Match``, falling back to ``If-Modified-Since`` (RFC 9110)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            # Weak comparison: W/"x" and "x" name the same representation.
+            ours = _opaque(self.etag)
+            return any(_opaque(tag) == ours for tag in if_none_match.split(","))
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision.
+        return _as_utc(self.last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _as_utc(value: datetime) -> datetime:
+    # The database hands back naive UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
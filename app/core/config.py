@@ -1,5 +1,7 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List
+from sqlalchemy.engine import make_url
+from typing import List, Optional
 import json
 
 
@@ -12,24 +14,112 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # verified claims; never past the token's exp
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5  # how soon other workers see a revocation
+    TOKEN_REVOCATION_PRUNE_SECONDS: int = 3600  # drop expired rows, rebuild the filter
+    TOKEN_REVOCATION_FILTER_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_FILTER_ERROR_RATE: float = 0.01
 
+    DB_URL: Optional[str] = None  # full SQLAlchemy URL; overrides the DB_* parts
     DB_HOST: str = "localhost"
     DB_PORT: int = 3306
-    DB_USER: str
-    DB_PASSWORD: str
-    DB_NAME: str
+    DB_USER: str = ""
+    DB_PASSWORD: str = ""
+    DB_NAME: str = ""
+
+    # Per engine and per worker: size the total, workers * (primary +
+    # replicas) * (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW), against MySQL's
+    # max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 3600  # below MySQL's wait_timeout; -1 disables
+    DB_POOL_PRE_PING: str = "always"  # "always", "idle" or "never"
+    DB_POOL_PRE_PING_IDLE_SECONDS: int = 30  # "idle": ping connections unused this long
+    DB_POOL_WARMUP_CONNECTIONS: Optional[int] = None  # opened at startup; default DB_POOL_SIZE
+
+    DB_REPLICA_HOSTS: List[str] = []  # "host" or "host:port"; same credentials
+    DB_REPLICA_MAX_LAG_SECONDS: int = 5
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: int = 5
+    READ_AFTER_WRITE_PRIMARY_SECONDS: int = 5
 
     API_KEY_PREFIX: str = "lms_"
+    API_KEY_CACHE_TTL_SECONDS: int = 60
+    API_KEY_CACHE_MAX_ENTRIES: int = 10_000
+    API_KEY_NEGATIVE_CACHE_TTL_SECONDS: int = 30  # unknown/inactive keys
+    API_KEY_NEGATIVE_CACHE_MAX_ENTRIES: int = 100_000
+    API_KEY_USAGE_FLUSH_SECONDS: int = 10  # last_used_at write-behind interval
+
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    SEARCH_BACKEND: str = "auto"  # "auto", "mysql" or "memory"
+
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_MAX_RECORD_BYTES: int = 1_048_576  # longer unterminated records are rejected
+    EXPORT_BATCH_SIZE: int = 1000
+
+    CACHE_BACKEND: str = "memory"  # "memory" or "redis"
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # With CACHE_BACKEND=memory, other workers see a role change or
+    # deactivation only once their entry expires.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 10
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    CATALOG_CACHE_ENABLED: bool = True  # serialized GET /books responses
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_ENTRIES: int = 1000
+    CATALOG_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # in-process backend only
+    CATALOG_CACHE_WARM_PAGES: int = 1  # default-sort pages prefilled at startup
+
+    OVERDUE_SWEEPER_ENABLED: bool = True
+    OVERDUE_SWEEPER_INTERVAL_SECONDS: int = 60
+    OVERDUE_SWEEPER_BATCH_SIZE: int = 500
+
+    REQUEST_TIMING_ENABLED: bool = False  # Server-Timing header + request log
+    SLOW_QUERY_MS: int = 0  # log statements slower than this; 0 disables
+    METRICS_ENABLED: bool = True  # Prometheus /metrics
+    OPENAPI_SCHEMA_PATH: Optional[str] = None  # prebuilt by scripts.build_openapi
+    STARTUP_PROFILE: bool = False  # startup phases and first request in /health
 
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
 
+    @model_validator(mode="after")
+    def _require_db_settings(self) -> "Settings":
+        if self.DB_URL is None:
+            missing = [
+                name
+                for name in ("DB_USER", "DB_PASSWORD", "DB_NAME")
+                if not getattr(self, name)
+            ]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} must be set when DB_URL is not")
+        return self
+
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return (
             f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}"
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def REPLICA_URLS(self) -> List[str]:
+        primary = make_url(self.DATABASE_URL)
+        urls = []
+        for entry in self.DB_REPLICA_HOSTS:
+            host, _, port = entry.partition(":")
+            url = primary.set(host=host, port=int(port) if port else primary.port)
+            urls.append(url.render_as_string(hide_password=False))
+        return urls
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Sequence
 
 from fastapi import Depends, Header, HTTPException, Security, status
@@ -9,24 +8,65 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core import metrics
 from app.core.config import settings
-from app.core.permissions import Permission
-from app.core.security import decode_token, hash_api_key
-from app.db.session import get_db
-from app.models import APIKey, Role, User
+from app.core.permissions import Permission, permission_mask, role_permission_table
+from app.core.principal import Principal, RolePrincipal, principal_cache
+from app.core.security import decode_token
+from app.db.session import get_auth_db, get_db, get_read_db
+from app.models import User
+from app.services import api_key_service
+from app.services.api_key_usage import api_key_usage
+from app.services.token_revocation import token_revocations
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
 
 
+async def load_principal(db: AsyncSession, user_id: int) -> Principal | None:
+    principal = await principal_cache.get(user_id)
+    if principal is not None:
+        metrics.PRINCIPAL_CACHE_LOOKUPS.labels("hit").inc()
+        return principal
+    metrics.PRINCIPAL_CACHE_LOOKUPS.labels("miss").inc()
+    result = await db.execute(
+        select(User).options(selectinload(User.role)).where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+    if not user:
+        return None
+    principal = Principal.from_user(user)
+    await principal_cache.set(principal)
+    return principal
+
+
 async def get_current_user(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_auth_db),
     authorization: str | None = Security(oauth2_scheme),
     api_key_header: str | None = Header(default=None, alias="X-API-Key"),
-) -> User:
+) -> Principal:
+    method = "jwt" if authorization else "api_key" if api_key_header else "none"
+    try:
+        principal = await _authenticate(db, authorization, api_key_header)
+    except HTTPException:
+        metrics.AUTH_REQUESTS.labels(method, "rejected").inc()
+        raise
+    metrics.AUTH_REQUESTS.labels(method, "ok").inc()
+    return principal
+
+
+async def _authenticate(
+    db: AsyncSession, authorization: str | None, api_key_header: str | None
+) -> Principal:
     # Prefer Bearer token if present
     if authorization:
-        payload = decode_token(authorization)
+        try:
+            payload = decode_token(authorization)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token",
+            )
         if payload.get("type") != "access":
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,10 +78,15 @@ async def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token payload",
             )
-        result = await db.execute(
-            select(User).options(selectinload(User.role)).where(User.id == int(user_id))
-        )
-        user = result.scalar_one_or_none()
+        # Tokens issued before ids were added cannot be revoked; they run
+        # out within ACCESS_TOKEN_EXPIRE_MINUTES.
+        jti = payload.get("jti")
+        if jti is not None and await token_revocations.is_revoked(db, jti):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked",
+            )
+        user = await load_principal(db, int(user_id))
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,24 +101,24 @@ async def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key prefix",
             )
-        key_hash = hash_api_key(api_key_header)
-        result = await db.execute(
-            select(APIKey).where(
-                APIKey.key_hash == key_hash, APIKey.is_active.is_(True)
-            )
-        )
-        api_key = result.scalar_one_or_none()
-        if not api_key:
+        api_key = await api_key_service.resolve_api_key(db, api_key_header)
+        if api_key is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or inactive API key",
             )
-        user = api_key.user
+        if api_key.expired:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="API key expired",
+            )
+        user = await load_principal(db, api_key.user_id)
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found or inactive",
             )
+        api_key_usage.record(api_key.key_id)
         return user
 
     raise HTTPException(
@@ -83,8 +128,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -94,23 +139,20 @@ async def get_current_active_user(
 
 
 def require_permissions(required: Sequence[Permission]):
+    required_mask = permission_mask(p.value for p in required)
+
     async def dependency(
-        current_user: User = Depends(get_current_active_user),
-    ) -> User:
-        role: Role | None = current_user.role
+        current_user: Principal = Depends(get_current_active_user),
+    ) -> Principal:
+        role: RolePrincipal | None = current_user.role
         if not role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User has no role",
             )
 
-        try:
-            assigned_perms = set(json.loads(role.permissions or "[]"))
-        except json.JSONDecodeError:
-            assigned_perms = set()
-
-        missing = [p.value for p in required if p.value not in assigned_perms]
-        if missing:
+        assigned_mask = role_permission_table.mask_for(role.id, role.permissions)
+        if assigned_mask & required_mask != required_mask:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.stats import percentiles
+
+request_logger = logging.getLogger("app.request")
+slow_query_logger = logging.getLogger("app.slow_query")
+
+
+@dataclass
+class RequestMetrics:
+    scope: Scope = field(repr=False)
+    started: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+    @property
+    def route(self) -> Optional[str]:
+        # Set by the router once the request has been matched.
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_VALUES_RE = re.compile(r"(VALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, literals and placeholder lists so equal queries group."""
+    sql = " ".join(statement.split())
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _VALUES_RE.sub(r"\1, ...", sql)
+    return _IN_LIST_RE.sub("(...)", sql)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.statements += 1
+        metrics.db_seconds += elapsed
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        route = metrics.route if metrics is not None else None
+        sql = normalize_sql(statement)
+        slow_query_logger.warning(
+            "slow query %.1fms route=%s sql=%s",
+            elapsed * 1000,
+            route,
+            sql,
+            extra={"duration_ms": round(elapsed * 1000, 3), "route": route, "sql": sql},
+        )
+
+
+class PoolCheckouts:
+    """Checkout times (a window of the most recent), waiters and timeouts of one pool."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.total = 0
+        self.waiting = 0  # callers inside Pool.connect(): queued or connecting
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.total += 1
+
+    def percentiles_ms(self) -> dict[str, float]:
+        if not self.samples:
+            return {}
+        values = percentiles(self.samples, 0.5, 0.95, 0.99, 1.0)
+        labels = ("p50", "p95", "p99", "max")
+        return {label: round(value * 1000, 3) for label, value in zip(labels, values)}
+
+
+# By engine name ("primary", "replica:<host>:<port>").
+pool_checkouts: dict[str, PoolCheckouts] = {}
+
+
+def _timed_pool_class(
+    base: type[Pool], checkouts: PoolCheckouts, wait_histogram: Any = None
+) -> type[Pool]:
+    class TimedPool(base):  # type: ignore[misc, valid-type]
+        def connect(self):
+            start = time.perf_counter()
+            checkouts.waiting += 1
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                checkouts.timeouts += 1
+                raise
+            finally:
+                checkouts.waiting -= 1
+                waited = time.perf_counter() - start
+                checkouts.observe(waited)
+                request = _current.get()
+                if request is not None:
+                    request.pool_wait_seconds += waited
+                if wait_histogram is not None:
+                    wait_histogram.observe(waited)
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def instrumentation_enabled() -> bool:
+    return settings.REQUEST_TIMING_ENABLED or settings.SLOW_QUERY_MS > 0
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Attach the enabled statement and pool-gauge hooks to ``engine``, and time checkouts."""
+    sync_engine = engine.sync_engine
+    if instrumentation_enabled():
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    # Pools have no "checkout started" event, so time Pool.connect() instead.
+    # Swapping the class (not the method) survives Engine.dispose(), which
+    # recreates the pool from its class. Always on: the pool stats endpoint
+    # reads the timings, and two perf_counter() calls per checkout are noise.
+    histogram = metrics.DB_POOL_WAIT.labels(name) if settings.METRICS_ENABLED else None
+    checkouts = pool_checkouts[name] = PoolCheckouts()
+    pool = sync_engine.pool
+    pool.__class__ = _timed_pool_class(type(pool), checkouts, histogram)
+    if settings.METRICS_ENABLED:
+        metrics.track_pool(engine, name)
+
+
+class RequestTimingMiddleware:
+    """Collects per-request SQL metrics and reports them.
+
+    Adds a ``Server-Timing`` header (``db``, ``pool`` and ``app`` durations)
+    and logs one ``app.request`` record per request with the same numbers as
+    structured fields. The slow query log uses it to name the route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope)
+        token = _current.set(metrics)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            if message["type"] == "http.response.start" and settings.REQUEST_TIMING_ENABLED:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self.server_timing(metrics).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if settings.REQUEST_TIMING_ENABLED:
+                self.log(metrics, status_code)
+
+    @staticmethod
+    def server_timing(metrics: RequestMetrics) -> str:
+        app_ms = (time.perf_counter() - metrics.started) * 1000
+        return (
+            f'db;dur={metrics.db_seconds * 1000:.2f};desc="{metrics.statements} queries", '
+            f"pool;dur={metrics.pool_wait_seconds * 1000:.2f}, "
+            f"app;dur={app_ms:.2f}"
+        )
+
+    @staticmethod
+    def log(metrics: RequestMetrics, status_code: int) -> None:
+        fields: dict[str, Any] = {
+            "method": metrics.scope["method"],
+            "path": metrics.scope["path"],
+            "route": metrics.route,
+            "status_code": status_code,
+            "duration_ms": round((time.perf_counter() - metrics.started) * 1000, 3),
+            "db_statements": metrics.statements,
+            "db_ms": round(metrics.db_seconds * 1000, 3),
+            "pool_wait_ms": round(metrics.pool_wait_seconds * 1000, 3),
+        }
+        request_logger.info(
+            "%(method)s %(path)s %(status_code)s %(duration_ms)sms "
+            "db=%(db_statements)s/%(db_ms)sms pool=%(pool_wait_ms)sms",
+            fields,
+            extra=fields,
+        )
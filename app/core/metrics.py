@@ -0,0 +1,174 @@
+"""Prometheus metrics.
+
+When uvicorn/gunicorn runs several workers, set ``PROMETHEUS_MULTIPROC_DIR``
+to an empty, writable directory before starting them; each worker then
+writes its samples there and ``/metrics`` aggregates all of them, whichever
+worker serves the scrape.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_EXCEPTIONS = Counter(
+    "http_request_exceptions_total",
+    "Requests that raised an unhandled exception.",
+    ["method", "route", "exception"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to the end of the response, by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+AUTH_REQUESTS = Counter(
+    "auth_requests_total",
+    "Authentication attempts by credential type and outcome.",
+    ["method", "outcome"],
+)
+PRINCIPAL_CACHE_LOOKUPS = Counter(
+    "principal_cache_lookups_total",
+    "Principal cache lookups during authentication.",
+    ["result"],
+)
+API_KEY_LOOKUPS = Counter(
+    "api_key_lookups_total",
+    "API key resolutions: cache hit, negative hit, database lookup or malformed.",
+    ["result"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size.", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+OVERDUE_BORROWS_MARKED = Counter(
+    "overdue_borrows_marked_total",
+    "Active borrows the overdue sweeper moved to overdue.",
+)
+OVERDUE_SWEEP_DURATION = Histogram(
+    "overdue_sweep_duration_seconds",
+    "Time for one overdue sweep, all batches included.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60),
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def track_pool(engine: AsyncEngine, name: str) -> None:
+    """Keep the pool gauges for ``engine`` current on every checkout/checkin."""
+    size = DB_POOL_SIZE.labels(name)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+
+    def update(*_) -> None:
+        pool = engine.sync_engine.pool  # replaced by Engine.dispose()
+        # NullPool (e.g. SQLite) has no size or overflow to report.
+        if hasattr(pool, "size"):
+            size.set(pool.size())
+            checked_out.set(pool.checkedout())
+            overflow.set(max(pool.overflow(), 0))
+
+    event.listen(engine.sync_engine, "checkout", update)
+    event.listen(engine.sync_engine, "checkin", update)
+    update()
+
+
+def render() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Records latency, status and in-flight gauges per route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as exc:
+            REQUEST_EXCEPTIONS.labels(method, self.route(scope), type(exc).__name__).inc()
+            raise
+        finally:
+            in_progress.dec()
+            route = self.route(scope)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+
+    @staticmethod
+    def route(scope: Scope) -> str:
+        # The template, not the raw path, keeps label cardinality bounded.
+        route = scope.get("route")
+        return getattr(route, "path", UNMATCHED_ROUTE)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+
+import fastapi
+import orjson
+import pydantic
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Stored in a prebuilt document so a stale one is detected at startup.
+DIGEST_KEY = "x-schema-digest"
+APP_SOURCE = Path(__file__).resolve().parents[1]
+
+
+def schema_digest(app: FastAPI) -> str:
+    """Fingerprint of everything the generated document is derived from.
+
+    That is the application source (endpoint signatures, schemas,
+    descriptions), the documented routes, the app's title and version, and
+    the FastAPI and Pydantic versions that render it.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(APP_SOURCE.rglob("*.py")):
+        digest.update(path.relative_to(APP_SOURCE).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    routes = sorted(
+        f"{','.join(sorted(route.methods))} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.include_in_schema
+    )
+    versions = (app.title, app.version, fastapi.__version__, pydantic.VERSION)
+    for part in (*versions, *routes):
+        digest.update(b"\0" + part.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def build_openapi(app: FastAPI) -> bytes:
+    """The app's OpenAPI document, tagged with ``schema_digest``."""
+    schema = {**app.openapi(), DIGEST_KEY: schema_digest(app)}
+    return orjson.dumps(schema)
+
+
+def use_prebuilt_openapi(app: FastAPI, path: str) -> bool:
+    """Serve the document at ``path`` instead of generating one on the first /docs hit.
+
+    Falls back to generating it (and logs why) if the file is missing,
+    unreadable or was built from different code.
+    """
+    try:
+        schema = orjson.loads(Path(path).read_bytes())
+    except (OSError, orjson.JSONDecodeError) as exc:
+        logger.warning("Cannot read OpenAPI schema %s: %s", path, exc)
+        return False
+    digest = schema.pop(DIGEST_KEY, None) if isinstance(schema, dict) else None
+    if digest != schema_digest(app):
+        logger.warning("OpenAPI schema %s is stale; rebuild it", path)
+        return False
+    app.openapi_schema = schema
+    return True
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Resolved ``sort`` parameter: the column to seek on plus the id tie-breaker."""
+
+    sort: str
+    column: InstrumentedAttribute
+    id_column: InstrumentedAttribute
+    descending: bool = False
+
+
+def resolve_sort(
+    sort: str,
+    allowed: Mapping[str, InstrumentedAttribute],
+    id_column: InstrumentedAttribute,
+) -> Keyset:
+    descending = sort.startswith("-")
+    column = allowed.get(sort.lstrip("-"))
+    if column is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort; expected one of: {', '.join(sorted(allowed))}",
+        )
+    return Keyset(sort=sort, column=column, id_column=id_column, descending=descending)
+
+
+def _encode_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(keyset: Keyset, value: Any, row_id: int) -> str:
+    raw = json.dumps([keyset.sort, _encode_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(keyset: Keyset, cursor: str) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort != keyset.sort or not isinstance(row_id, int):
+            raise ValueError("cursor does not match sort order")
+        if keyset.column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from None
+    return value, row_id
+
+
+def paginate(
+    stmt: Select,
+    keyset: Keyset,
+    after: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Select:
+    """Order ``stmt`` by ``(sort_key, id)`` and seek past ``after`` if given.
+
+    Without a cursor the legacy ``skip`` offset is applied instead.
+    """
+    column, id_column = keyset.column, keyset.id_column
+    if keyset.descending:
+        stmt = stmt.order_by(column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(column, id_column)
+
+    if after is None:
+        return stmt.offset(skip).limit(limit)
+
+    value, row_id = decode_cursor(keyset, after)
+    if column is id_column:
+        seek = id_column < row_id if keyset.descending else id_column > row_id
+    elif keyset.descending:
+        seek = or_(column < value, and_(column == value, id_column < row_id))
+    else:
+        seek = or_(column > value, and_(column == value, id_column > row_id))
+    return stmt.where(seek).limit(limit)
+
+
+def next_cursor(rows: Sequence[Any], keyset: Keyset, limit: int) -> str | None:
+    """The cursor for the page after ``rows``, or ``None`` if the page is not full."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(
+        keyset, getattr(last, keyset.column.key), getattr(last, keyset.id_column.key)
+    )
+
+
+def set_next_cursor(
+    response: Response, rows: Sequence[Any], keyset: Keyset, limit: int
+) -> None:
+    """Expose the cursor for the page after ``rows`` when the page is full."""
+    cursor = next_cursor(rows, keyset, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+from app.core.stats import percentiles
+
+T = TypeVar("T")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the password hashing queue is full."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHashPool:
+    """Runs bcrypt off the event loop on a bounded thread or process pool.
+
+    At most ``workers`` calls run at once and at most ``max_queue`` wait for a
+    slot; further calls fail fast with ``PoolSaturatedError``.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: str = "thread") -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(workers)
+
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=1024)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - start
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self._recent_waits.append(waited)
+
+        self.active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        p50, p99 = percentiles(self._recent_waits, 0.50, 0.99)
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.waiting,
+            "active": self.active,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            "wait_ms_p50": round(p50 * 1000, 3),
+            "wait_ms_p99": round(p99 * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 from enum import StrEnum, auto
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, List, Set, Tuple
 
 
 class Permission(StrEnum):
@@ -58,3 +59,53 @@ ROLE_PERMISSIONS: Dict[RoleName, List[Permission]] = {
 def permissions_to_strings(perms: Iterable[Permission]) -> List[str]:
     return [p.value for p in perms]
 
+
+# Bit assigned to each permission, in enum declaration order.
+PERMISSION_BITS: Dict[str, int] = {p.value: 1 << i for i, p in enumerate(Permission)}
+
+
+def permission_mask(perms: Iterable[str]) -> int:
+    """Fold permission values into a bitmask; unknown values are ignored."""
+    mask = 0
+    for perm in perms:
+        mask |= PERMISSION_BITS.get(perm, 0)
+    return mask
+
+
+def compile_role_permissions(permissions_json: str | None) -> int:
+    try:
+        perms = json.loads(permissions_json or "[]")
+    except json.JSONDecodeError:
+        return 0
+    if not isinstance(perms, list):
+        return 0
+    return permission_mask(p for p in perms if isinstance(p, str))
+
+
+class RolePermissionTable:
+    """Per-process table of compiled role permission masks.
+
+    Entries remember the JSON they were compiled from, so a principal carrying
+    a different permission list (e.g. one cached by another worker before a
+    role change) recompiles instead of reusing a stale mask.
+    """
+
+    def __init__(self) -> None:
+        self._masks: Dict[int, Tuple[str | None, int]] = {}
+
+    def mask_for(self, role_id: int, permissions_json: str | None) -> int:
+        entry = self._masks.get(role_id)
+        if entry is not None and entry[0] == permissions_json:
+            return entry[1]
+        mask = compile_role_permissions(permissions_json)
+        self._masks[role_id] = (permissions_json, mask)
+        return mask
+
+    def invalidate(self, role_id: int | None = None) -> None:
+        if role_id is None:
+            self._masks.clear()
+        else:
+            self._masks.pop(role_id, None)
+
+
+role_permission_table = RolePermissionTable()
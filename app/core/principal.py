@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.core.cache import CacheBackend, build_cache_backend
+from app.core.config import settings
+from app.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class RolePrincipal:
+    id: int
+    name: str
+    permissions: str
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Detached, immutable snapshot of the authenticated user and their role.
+
+    Exposes the same attributes handlers read from ``User`` so it can be
+    returned by ``get_current_user`` and cached across requests.
+    """
+
+    id: int
+    username: str
+    email: str
+    full_name: str
+    is_active: bool
+    role_id: int
+    role: RolePrincipal | None
+
+    @classmethod
+    def from_user(cls, user: User) -> Principal:
+        role = user.role
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            role_id=user.role_id,
+            role=(
+                RolePrincipal(id=role.id, name=role.name, permissions=role.permissions)
+                if role
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Principal:
+        role = data.get("role")
+        return cls(**{**data, "role": RolePrincipal(**role) if role else None})
+
+
+class PrincipalCache:
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @property
+    def stats(self):
+        return self.backend.stats
+
+    async def get(self, user_id: int) -> Principal | None:
+        return await self.backend.get(str(user_id))
+
+    async def set(self, principal: Principal) -> None:
+        await self.backend.set(str(principal.id), principal)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        await self.backend.delete(str(user_id))
+
+    async def invalidate_role(self, role_id: int) -> None:
+        # Role changes are rare admin operations; dropping every entry is
+        # cheaper than tracking which principals hold the role.
+        await self.backend.clear()
+
+
+principal_cache = PrincipalCache(
+    build_cache_backend(
+        "principal",
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        dumps=lambda p: json.dumps(asdict(p)),
+        loads=lambda raw: Principal.from_dict(json.loads(raw)),
+    )
+)
@@ -1,11 +1,13 @@
 from datetime import datetime, timedelta, timezone
 import hashlib
+import secrets
+import uuid
 from typing import Any, Dict
 
 import bcrypt
-from jose import JWTError, jwt
-
 from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.core.tokens import token_verifier
 
 
 def hash_password(password: str) -> str:
@@ -21,6 +23,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_byte_enc, hashed_password_enc)
 
 
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
 # Backwards-compatible alias
 get_password_hash = hash_password
 
@@ -33,13 +43,15 @@ def _create_token(
     to_encode = data.copy()
     now = datetime.now(timezone.utc)
     expire = now + expires_delta
-    to_encode.update({"exp": expire, "iat": now, "type": token_type})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
+    to_encode.update(
+        {
+            "exp": int(expire.timestamp()),
+            "iat": int(now.timestamp()),
+            "type": token_type,
+            "jti": uuid.uuid4().hex,  # lets this one token be revoked
+        }
     )
-    return encoded_jwt
+    return token_verifier.encode(to_encode)
 
 
 def create_access_token(data: Dict[str, Any]) -> str:
@@ -52,21 +64,19 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return _create_token(data, expires_delta, token_type="refresh")
 
 
-def decode_token(token: str) -> Dict[str, Any]:
-    try:
-        return jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-    except JWTError as exc:
-        raise ValueError("Invalid token") from exc
+def decode_token(token: str, cache: bool = True) -> Dict[str, Any]:
+    """Verified claims of ``token``; raises ``ValueError`` if it is invalid.
+
+    ``cache=False`` skips the verified-claims cache, for tokens that are only
+    presented once (refresh tokens).
+    """
+    return token_verifier.decode(token, cache=cache)
 
 
 def generate_api_key() -> tuple[str, str]:
     """Return (raw_key_with_prefix, key_hash)."""
     # 32 bytes random -> hex string
-    raw = hashlib.sha256(hashlib.token_bytes(32)).hexdigest()
+    raw = hashlib.sha256(secrets.token_bytes(32)).hexdigest()
     raw_with_prefix = f"{settings.API_KEY_PREFIX}{raw}"
     key_hash = hash_api_key(raw_with_prefix)
     return raw_with_prefix, key_hash
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode ``content``; datetimes come out as ISO 8601 like Pydantic's."""
+    return orjson.dumps(content)
+
+
+def parse_fields(fields: str | None, allowed: Sequence[str]) -> tuple[str, ...]:
+    """Resolve a ``fields=a,b`` sparse fieldset to a subset of ``allowed``.
+
+    Fields keep the schema's order; ``None`` selects all of them.
+    """
+    if fields is None:
+        return tuple(allowed)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid fields; expected any of: {', '.join(allowed)}",
+        )
+    return tuple(name for name in allowed if name in requested)
+
+
+def row_columns(
+    model: type, fields: Sequence[str], *extra: InstrumentedAttribute
+) -> list[InstrumentedAttribute]:
+    """``model``'s columns for ``fields`` in order, then any ``extra`` not among them.
+
+    Extra columns (such as the keyset columns needed for the next cursor) are
+    selected but left out of ``rows_to_json``'s output.
+    """
+    columns = [getattr(model, name) for name in fields]
+    selected = set(fields)
+    for column in extra:
+        if column.key not in selected:
+            columns.append(column)
+            selected.add(column.key)
+    return columns
+
+
+def rows_to_json(rows: Iterable[Row], fields: Sequence[str]) -> bytes:
+    """Serialize Core rows selected with ``row_columns`` as a JSON array of objects.
+
+    Skips ORM hydration and per-row model validation; the rows must already
+    match the response schema's types.
+    """
+    return orjson.dumps([dict(zip(fields, row)) for row in rows])
@@ -0,0 +1,91 @@
+"""Cold-start timings, reported in /health when ``STARTUP_PROFILE`` is set.
+
+``app.main`` imports this module before anything else so that importing
+the application is part of what gets timed; it therefore uses only the
+standard library.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process was started, where ``/proc`` says (Linux)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesized command name; starttime is field 22.
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfile:
+    """Marks on the ``perf_counter`` clock from process start to first response."""
+
+    def __init__(self) -> None:
+        now = time.perf_counter()
+        age = _process_age()
+        self.process_started = None if age is None else now - age
+        self.marks: dict[str, float] = {"import": now}
+        self.first_request: Optional[dict[str, Any]] = None
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.perf_counter()
+
+    def _span_ms(self, start: Optional[float], end: Optional[float]) -> Optional[float]:
+        if start is None or end is None:
+            return None
+        return round((end - start) * 1000, 1)
+
+    def record_first_request(self, path: str, started: float, finished: float) -> None:
+        self.first_request = {
+            "path": path,
+            "duration_ms": self._span_ms(started, finished),
+            "after_ready_ms": self._span_ms(self.marks.get("ready"), started),
+            "since_process_start_ms": self._span_ms(self.process_started, finished),
+        }
+        logger.info("First request served", extra=self.first_request)
+
+    def stats(self) -> dict[str, Any]:
+        marks = self.marks
+        return {
+            "interpreter_ms": self._span_ms(self.process_started, marks["import"]),
+            "import_ms": self._span_ms(marks["import"], marks.get("imported")),
+            "create_app_ms": self._span_ms(marks.get("imported"), marks.get("created")),
+            "lifespan_ms": self._span_ms(marks.get("lifespan"), marks.get("ready")),
+            "ready_ms": self._span_ms(self.process_started, marks.get("ready")),
+            "first_request": self.first_request,
+        }
+
+
+startup_profile = StartupProfile()
+
+
+class FirstRequestMiddleware:
+    """Times the first HTTP request, then passes everything straight through."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.seen = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.seen or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.seen = True
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            startup_profile.record_first_request(
+                scope["path"], started, time.perf_counter()
+            )
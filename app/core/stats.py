@@ -0,0 +1,18 @@
+"""Latency percentiles for the app's diagnostics and the benchmark clients.
+
+Standard library only, so the benchmarks can import it without configuring
+the app.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+
+def percentiles(values: Iterable[float], *quantiles: float) -> list[float]:
+    """Nearest-rank ``quantiles`` (0 to 1) of ``values``; all 0.0 when empty."""
+    ordered = sorted(values)
+    if not ordered:
+        return [0.0 for _ in quantiles]
+    last = len(ordered) - 1
+    return [ordered[min(last, int(q * len(ordered)))] for q in quantiles]
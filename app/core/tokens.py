@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HMACCodec:
+    """Compact JWS encoding and verification for one HMAC algorithm and key.
+
+    Produces the same tokens as python-jose and applies the same ``exp``,
+    ``nbf`` and ``aud`` checks (no leeway, no audience configured), without
+    its per-call key preparation and algorithm dispatch.
+    """
+
+    def __init__(self, secret: str, algorithm: str) -> None:
+        self.algorithm = algorithm
+        self._digest = _HMAC_DIGESTS[algorithm]
+        self._key = secret.encode("utf-8")
+        self._header = _b64encode(
+            orjson.dumps({"alg": algorithm, "typ": "JWT"})
+        )
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return _b64encode(hmac.new(self._key, signing_input, self._digest).digest())
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        signing_input = self._header + b"." + _b64encode(orjson.dumps(claims))
+        return (signing_input + b"." + self._sign(signing_input)).decode("ascii")
+
+    def decode(self, token: str, now: float) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.encode("ascii").rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            if not payload or b"." in payload:
+                raise ValueError("malformed")
+            # Compared in encoded form, so only the canonical signature passes.
+            if not hmac.compare_digest(self._sign(signing_input), signature):
+                raise ValueError("bad signature")
+            if header != self._header:
+                # Same algorithm, differently serialized header.
+                if orjson.loads(_b64decode(header)).get("alg") != self.algorithm:
+                    raise ValueError("unexpected algorithm")
+            claims = orjson.loads(_b64decode(payload))
+        except (ValueError, AttributeError) as exc:
+            raise ValueError("Invalid token") from exc
+        if not isinstance(claims, dict):
+            raise ValueError("Invalid token")
+        exp = claims.get("exp")
+        if exp is not None and (not _is_number(exp) or exp < now):
+            raise ValueError("Invalid token")
+        nbf = claims.get("nbf")
+        if nbf is not None and (not _is_number(nbf) or nbf > now):
+            raise ValueError("Invalid token")
+        if "aud" in claims:
+            raise ValueError("Invalid token")
+        return claims
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class TokenVerifier:
+    """Encodes and verifies tokens with the configured key and algorithm.
+
+    HMAC algorithms go through ``HMACCodec``; anything else falls back to
+    python-jose. Verified claims are cached by token digest until the
+    earlier of ``ttl`` and the token's ``exp``, and the whole cache is
+    dropped when ``SECRET_KEY`` or ``ALGORITHM`` changes.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self._cache: TTLCache[bytes, tuple[Optional[float], Dict[str, Any]]] = (
+            TTLCache(max_entries=max_entries, ttl=ttl)
+        )
+        self._config: Optional[tuple[str, str]] = None
+        self._codec: Optional[HMACCodec] = None
+
+    def _current_codec(self) -> Optional[HMACCodec]:
+        config = (settings.SECRET_KEY, settings.ALGORITHM)
+        if config != self._config:
+            self._cache.clear()
+            secret, algorithm = config
+            self._codec = (
+                HMACCodec(secret, algorithm) if algorithm in _HMAC_DIGESTS else None
+            )
+            self._config = config
+        return self._codec
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        codec = self._current_codec()
+        if codec is not None:
+            return codec.encode(claims)
+        from jose import jwt
+
+        return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    def decode(self, token: str, cache: bool = True) -> Dict[str, Any]:
+        """Return the token's claims; raise ``ValueError`` if it is invalid."""
+        codec = self._current_codec()
+        now = time.time()
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        if cache:
+            entry = self._cache.get(key)
+            if entry is not None:
+                exp, claims = entry
+                if exp is None or exp >= now:
+                    return dict(claims)
+                self._cache.delete(key)
+
+        if codec is not None:
+            claims = codec.decode(token, now)
+        else:
+            # Imported on demand: python-jose (and its crypto backends) is a
+            # noticeable share of startup, and HMAC deployments never need it.
+            from jose import JWTError, jwt
+
+            try:
+                claims = jwt.decode(
+                    token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+                )
+            except JWTError as exc:
+                raise ValueError("Invalid token") from exc
+
+        if cache:
+            exp = claims.get("exp")
+            ttl = self._cache.ttl if exp is None else min(self._cache.ttl, exp - now)
+            self._cache.set(key, (exp, claims), ttl)
+            claims = dict(claims)
+        return claims
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._cache),
+            "algorithm": settings.ALGORITHM,
+            "fast_path": self._codec is not None,
+            **self._cache.stats.as_dict(),
+        }
+
+
+token_verifier = TokenVerifier(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
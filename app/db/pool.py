@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.core.instrumentation import instrument_engine, pool_checkouts
+
+logger = logging.getLogger(__name__)
+
+PRE_PING_MODES = ("always", "idle", "never")
+
+
+def engine_options(url: str) -> dict[str, Any]:
+    """``create_async_engine`` keyword arguments from the ``DB_POOL_*`` settings."""
+    if settings.DB_POOL_PRE_PING not in PRE_PING_MODES:
+        raise ValueError(
+            f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_MODES)}"
+        )
+    options: dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    # SQLite gets a NullPool (files) or StaticPool (memory): nothing to size.
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+    return options
+
+
+def _ping_idle_connections(engine: AsyncEngine, idle_seconds: float) -> None:
+    """Ping a connection on checkout only if it sat in the pool ``idle_seconds``.
+
+    Connections in steady use skip the round trip that ``pool_pre_ping``
+    pays on every checkout; one that fails its ping is replaced, as with
+    ``pool_pre_ping``.
+    """
+    sync_engine = engine.sync_engine
+
+    def on_checkin(dbapi_connection, record) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    def on_checkout(dbapi_connection, record, proxy) -> None:
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as error:
+            # The pool discards the connection and retries with a new one.
+            raise exc.DisconnectionError() from error
+
+    event.listen(sync_engine, "checkin", on_checkin)
+    event.listen(sync_engine, "checkout", on_checkout)
+
+
+def build_engine(url: str, name: str) -> AsyncEngine:
+    """An engine configured from the ``DB_POOL_*`` settings and instrumented as ``name``."""
+    engine = create_async_engine(url, **engine_options(url))
+    if settings.DB_POOL_PRE_PING == "idle":
+        _ping_idle_connections(engine, settings.DB_POOL_PRE_PING_IDLE_SECONDS)
+    instrument_engine(engine, name)
+    return engine
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` connections at once and return them to the pool.
+
+    Saves the first requests after a deploy the connect and authentication
+    round trips. Returns how many were opened.
+    """
+    opened = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    conns = [conn for conn in opened if not isinstance(conn, BaseException)]
+    for conn in conns:
+        await conn.close()
+    failures = [error for error in opened if isinstance(error, BaseException)]
+    if failures:
+        logger.warning(
+            "Opened %d of %d pool connections for %s: %r",
+            len(conns),
+            connections,
+            engine.url.render_as_string(),
+            failures[0],
+        )
+    return len(conns)
+
+
+def pool_stats(engine: AsyncEngine, name: str) -> dict[str, Any]:
+    """This process's view of ``engine``'s pool."""
+    pool = engine.sync_engine.pool
+    stats: dict[str, Any] = {
+        "name": name,
+        "class": type(pool).__name__.removeprefix("Timed"),
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "recycle_seconds": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    # Only queue pools have a size; NullPool opens a connection per checkout.
+    if hasattr(pool, "size"):
+        stats.update(
+            size=pool.size(),
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            max_connections=pool.size() + settings.DB_POOL_MAX_OVERFLOW,
+            timeout_seconds=pool.timeout(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    checkouts = pool_checkouts.get(name)
+    if checkouts is not None:
+        stats.update(
+            waiting=checkouts.waiting,
+            checkouts=checkouts.total,
+            timeouts=checkouts.timeouts,
+            checkout_ms=checkouts.percentiles_ms(),
+        )
+    return stats
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.pool import build_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    name: str
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    checked_at: float = 0.0
+    reads: int = 0
+    _checking: bool = field(default=False, repr=False)
+
+
+class ReplicaRouter:
+    """Spreads read-only sessions across replicas, round robin.
+
+    Each replica is probed at most every ``check_interval`` seconds (by the
+    request that finds its status stale); a replica that is unreachable,
+    not replicating or lagging more than ``max_lag`` seconds is skipped until
+    the next probe. When no replica qualifies, reads go to the primary.
+    """
+
+    probe_timeout = 2.0
+
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float) -> None:
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.replicas = []
+        for url in urls:
+            parsed = make_url(url)
+            name = f"replica:{parsed.host}:{parsed.port}"
+            self.replicas.append(Replica(engine=build_engine(url, name), name=name))
+        self._next = itertools.count()
+        self.primary_fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    async def _lag(self, replica: Replica) -> Optional[float]:
+        async with replica.engine.connect() as conn:
+            if conn.dialect.name != "mysql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+                key = "Seconds_Behind_Source"
+            except Exception:  # MySQL < 8.0.22
+                row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()
+                key = "Seconds_Behind_Master"
+            if row is None:
+                return 0.0  # not configured as a replica; nothing to lag behind
+            lag = row.get(key)
+            return None if lag is None else float(lag)
+
+    async def _probe(self, replica: Replica) -> None:
+        replica._checking = True
+        try:
+            lag = await asyncio.wait_for(self._lag(replica), self.probe_timeout)
+            replica.lag_seconds = lag
+            replica.healthy = lag is not None and lag <= self.max_lag
+        except Exception as exc:
+            logger.warning("Read replica %s is unavailable: %r", replica.engine.url, exc)
+            replica.lag_seconds = None
+            replica.healthy = False
+        finally:
+            replica.checked_at = time.monotonic()
+            replica._checking = False
+
+    async def pick(self) -> Optional[AsyncEngine]:
+        """Return the engine of the next healthy replica, or None for the primary."""
+        if not self.replicas:
+            return None
+        start = next(self._next)
+        now = time.monotonic()
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if now - replica.checked_at >= self.check_interval and not replica._checking:
+                await self._probe(replica)
+            if replica.healthy:
+                replica.reads += 1
+                return replica.engine
+        self.primary_fallbacks += 1
+        return None
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        for replica in self.replicas:
+            if replica.engine is engine:
+                replica.healthy = False
+                replica.checked_at = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "replicas": [
+                {
+                    "host": replica.engine.url.host,
+                    "port": replica.engine.url.port,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "reads": replica.reads,
+                }
+                for replica in self.replicas
+            ],
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    settings.REPLICA_URLS,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+)
@@ -1,18 +1,31 @@
 import asyncio
 import json
+from pathlib import Path
 
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import select
+from sqlalchemy.engine import Connection
 
 from app.core.permissions import ROLE_PERMISSIONS, RoleName, permissions_to_strings
 from app.core.security import hash_password
-from app.db.session import AsyncSessionLocal, Base, engine
-from app.models import Role, User  # ensure models are imported so metadata is populated
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Role, User
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def run_migrations(connection: Connection) -> None:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
 
 
 async def seed() -> None:
-    # Create all tables
+    # Bring the schema up to date
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
 
     async with AsyncSessionLocal() as db:
         # Seed roles
@@ -1,14 +1,16 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.db.pool import build_engine
+from app.db.replicas import replica_router
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-)
+engine = build_engine(settings.DATABASE_URL, "primary")
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -16,17 +18,81 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Set on responses to writes; reads carrying it go to the primary until it
+# expires, so clients see their own changes despite replication lag.
+PRIMARY_COOKIE = "lms_read_primary"
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+_AFTER_COMMIT = "after_commit"
+
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request, response: Response) -> AsyncSession:
+    if replica_router.enabled and request.method not in _SAFE_METHODS:
+        window = settings.READ_AFTER_WRITE_PRIMARY_SECONDS
+        response.set_cookie(
+            PRIMARY_COOKIE, str(int(time.time()) + window), max_age=window, httponly=True
+        )
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
         except Exception:
+            session.info.pop(_AFTER_COMMIT, None)
             await session.rollback()
             raise
+        for callback in session.info.pop(_AFTER_COMMIT, ()):
+            await callback()
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` once ``get_db`` has committed ``db``; dropped on rollback.
+
+    For side effects (such as cache invalidation) that must not become
+    visible before the transaction does.
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+def _wants_primary(request: Request) -> bool:
+    until = request.cookies.get(PRIMARY_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Session for read-only requests: a healthy replica when one is configured.
+
+    Nothing is written through it, so it is closed without a commit.
+    """
+    bind = None
+    if replica_router.enabled and not _wants_primary(request):
+        bind = await replica_router.pick()
+    async with AsyncSessionLocal(bind=bind or engine) as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            if bind is not None and exc.connection_invalidated:
+                replica_router.mark_down(bind)
+            raise
+
+
+async def get_auth_db() -> AsyncSession:
+    """Read-only session on the primary for authenticating a request.
+
+    Not a replica: a revoked token or deactivated user must be refused as
+    soon as the change commits. Closed without a commit, and it only takes
+    a connection on a cache miss.
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
 
+async def read_session() -> AsyncSession:
+    """A read-only session outside of a request (e.g. for streamed exports)."""
+    bind = await replica_router.pick() if replica_router.enabled else None
+    return AsyncSessionLocal(bind=bind or engine)
@@ -1,15 +1,71 @@
+# First, so that importing everything below is part of the startup profile.
+from app.core.startup import FirstRequestMiddleware, startup_profile
+
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-from app.api.v1.router import api_router
+from app.api.v1.router import include_api_routers
+from app.core import metrics
 from app.core.config import settings
+from app.core.instrumentation import RequestTimingMiddleware, instrumentation_enabled
+from app.core.openapi import use_prebuilt_openapi
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.password_pool import PoolSaturatedError, password_pool
+from app.core.tokens import token_verifier
+from app.db.pool import warm_pool
+from app.db.replicas import replica_router
+from app.db.session import engine
+from app.services import api_key_service, book_service
+from app.services.api_key_usage import api_key_usage
+from app.services.catalog_cache import catalog_cache
+from app.services.overdue_sweeper import overdue_sweeper
+from app.services.token_revocation import token_revocations
+
+logger = logging.getLogger(__name__)
+
+startup_profile.mark("imported")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    startup_profile.mark("lifespan")
+    warmup = settings.DB_POOL_WARMUP_CONNECTIONS
+    if warmup is None:
+        warmup = settings.DB_POOL_SIZE
+    engines = [engine, *(replica.engine for replica in replica_router.replicas)]
+    # Failures are logged, not raised: a cold pool only costs latency.
+    await asyncio.gather(
+        *(
+            warm_pool(e, warmup)
+            for e in engines
+            if warmup > 0 and hasattr(e.sync_engine.pool, "size")
+        )
+    )
+    if catalog_cache.enabled and settings.CATALOG_CACHE_WARM_PAGES > 0:
+        try:
+            await book_service.warm_catalog_cache(settings.CATALOG_CACHE_WARM_PAGES)
+        except Exception:
+            # A cold cache only costs latency; do not refuse to start over it.
+            logger.warning("Catalog cache warmup failed", exc_info=True)
+    if settings.OVERDUE_SWEEPER_ENABLED:
+        overdue_sweeper.start()
+    await token_revocations.start()
+    api_key_usage.start()
+    startup_profile.mark("ready")
+    if settings.STARTUP_PROFILE:
+        logger.info("Startup complete", extra=startup_profile.stats())
     yield
+    await api_key_usage.stop()
+    await token_revocations.stop()
+    await overdue_sweeper.stop()
+    await replica_router.dispose()
+    password_pool.shutdown()
+    metrics.mark_process_dead()
 
 
 def create_app() -> FastAPI:
@@ -25,6 +81,7 @@ def create_app() -> FastAPI:
             {"name": "books", "description": "Book management"},
             {"name": "borrows", "description": "Borrow management"},
             {"name": "roles", "description": "Role management"},
+            {"name": "admin", "description": "Operational diagnostics"},
         ],
     )
 
@@ -34,14 +91,53 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
+    if instrumentation_enabled():
+        app.add_middleware(RequestTimingMiddleware)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(metrics.MetricsMiddleware)
+
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            body, content_type = metrics.render()
+            return Response(body, media_type=content_type)
+
+    # Outermost, so the first request is timed end to end.
+    if settings.STARTUP_PROFILE:
+        app.add_middleware(FirstRequestMiddleware)
+
+    @app.exception_handler(PoolSaturatedError)
+    async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server busy, please retry"},
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.get("/health")
     async def health():
-        return {"status": "ok"}
+        report = {
+            "status": "ok",
+            "password_pool": password_pool.stats(),
+            "overdue_sweeper": overdue_sweeper.stats(),
+            "read_replicas": replica_router.stats(),
+            "catalog_cache": catalog_cache.stats.as_dict(),
+            "api_key_cache": api_key_service.cache_stats(),
+            "token_cache": token_verifier.stats(),
+            "token_revocations": token_revocations.stats(),
+            "api_key_usage": api_key_usage.stats(),
+        }
+        if settings.STARTUP_PROFILE:
+            report["startup"] = startup_profile.stats()
+        return report
 
-    app.include_router(api_router, prefix="/api/v1")
+    include_api_routers(app)
+    if settings.OPENAPI_SCHEMA_PATH:
+        use_prebuilt_openapi(app, settings.OPENAPI_SCHEMA_PATH)
     return app
 
 
 app = create_app()
+startup_profile.mark("created")
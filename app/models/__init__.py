@@ -1,6 +1,7 @@
 from app.models.base import TimestampMixin
 from app.models.book import Book
 from app.models.borrow import Borrow
+from app.models.token import RevokedToken
 from app.models.user import APIKey, Role, User
 
-__all__ = ["TimestampMixin", "Book", "Borrow", "APIKey", "Role", "User"]
+__all__ = ["TimestampMixin", "Book", "Borrow", "APIKey", "Role", "RevokedToken", "User"]
@@ -4,13 +4,20 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db.session import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class TimestampMixin:
+    # Stamped in Python as well as by the server default, so the ORM knows the
+    # values after INSERT/UPDATE without reading the row back.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utcnow,
         nullable=False,
     )
\ No newline at end of file
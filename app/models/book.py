@@ -1,12 +1,31 @@
-from sqlalchemy import String, Integer, Text, Numeric
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, Integer, Text, Numeric, func
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
-from app.models.base import TimestampMixin
+from app.models.base import TimestampMixin, utcnow
 
 
 class Book(Base, TimestampMixin):
     __tablename__ = "books"
+    __table_args__ = (
+        Index(
+            "ft_books_title_author_description",
+            "title",
+            "author",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+        # Keyset sort orders and search filters (see book_service/search_service).
+        Index("ix_books_title", "title"),
+        Index("ix_books_author", "author"),
+        Index("ix_books_genre", "genre"),
+        Index("ix_books_created_at", "created_at"),
+        # max(updated_at) feeds the catalog's ETag (see book_service.catalog_state).
+        Index("ix_books_updated_at", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     isbn: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
@@ -18,5 +37,14 @@ class Book(Base, TimestampMixin):
     total_copies: Mapped[int] = mapped_column(Integer, default=1)
     available_copies: Mapped[int] = mapped_column(Integer, default=1)
     published_year: Mapped[int | None] = mapped_column(Integer)
+    # Microsecond precision on MySQL too, so two changes within one second
+    # still produce different ETags.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
+    )
 
     borrows: Mapped[list] = relationship("Borrow", back_populates="book")
\ No newline at end of file
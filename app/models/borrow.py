@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from enum import StrEnum
-from sqlalchemy import String, ForeignKey, DateTime, Text
+from sqlalchemy import Index, String, ForeignKey, DateTime, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -16,6 +16,14 @@ class BorrowStatus(StrEnum):
 
 class Borrow(Base, TimestampMixin):
     __tablename__ = "borrows"
+    __table_args__ = (
+        # Member-scoped listings, per-book circulation and overdue scans
+        # (see borrow_service/export_service).
+        Index("ix_borrows_user_id_status", "user_id", "status"),
+        Index("ix_borrows_book_id_status", "book_id", "status"),
+        Index("ix_borrows_status_due_date", "status", "due_date"),
+        Index("ix_borrows_borrowed_at", "borrowed_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+from app.models.base import TimestampMixin
+
+
+class RevokedToken(Base, TimestampMixin):
+    """A JWT id (``jti``) that must no longer be accepted.
+
+    ``created_at`` is the revocation time; rows can be deleted once the
+    token itself has expired.
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_created_at", "created_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    jti: Mapped[str] = mapped_column(String(32), unique=True, nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from sqlalchemy import String, Boolean, ForeignKey, Text
+from datetime import datetime
+from sqlalchemy import DateTime, Index, String, Boolean, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -19,6 +20,10 @@ class Role(Base, TimestampMixin):
 
 class User(Base, TimestampMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_id", "role_id"),
+        Index("ix_users_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -36,12 +41,15 @@ class User(Base, TimestampMixin):
 
 class APIKey(Base, TimestampMixin):
     __tablename__ = "api_keys"
+    __table_args__ = (Index("ix_api_keys_user_id", "user_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     key_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    expires_at: Mapped[str | None] = mapped_column(String(50))  # ISO datetime string
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Written in batches by api_key_usage, not on every request.
+    last_used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     user: Mapped[User] = relationship("User", back_populates="api_keys")
\ No newline at end of file
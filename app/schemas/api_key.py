@@ -1,11 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 
 
 class APIKeyCreate(BaseModel):
     name: str
+    expires_at: Optional[datetime] = None  # naive values are taken as UTC
+
+    @field_validator("expires_at")
+    @classmethod
+    def _to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Stored and compared as naive UTC, like the timestamp columns.
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
 
 
 class APIKeyOut(BaseModel):
@@ -13,7 +22,11 @@ class APIKeyOut(BaseModel):
     name: str
     is_active: bool
     created_at: datetime
-    expires_at: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    last_used_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class APIKeyCreated(APIKeyOut):
+    key: str  # the raw key; only its hash is stored, so it is shown once
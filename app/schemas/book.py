@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -36,3 +36,19 @@ class BookOut(BookBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class ImportRowError(BaseModel):
+    row: int
+    isbn: Optional[str] = None
+    detail: str
+
+
+class BookImportResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    superseded: int = 0  # replaced by a later row for the same ISBN
+    failed: int = 0  # valid rows lost to a database error
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
+    error: Optional[str] = None
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BorrowCreate(BaseModel):
@@ -23,3 +23,26 @@ class BorrowOut(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class BorrowBatchCreate(BaseModel):
+    book_ids: List[int] = Field(min_length=1, max_length=100)
+    user_id: Optional[int] = None  # defaults to current user if omitted
+    days: int = 14
+    notes: Optional[str] = None
+
+
+class ReturnBatchRequest(BaseModel):
+    borrow_ids: List[int] = Field(min_length=1, max_length=100)
+
+
+class BatchItemResult(BaseModel):
+    id: int  # the requested book id (checkout) or borrow id (return)
+    status_code: int
+    detail: Optional[str] = None
+    borrow: Optional[BorrowOut] = None
+
+
+class BatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: List[BatchItemResult]
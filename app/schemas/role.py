@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from app.core.permissions import Permission
+
 
 class RoleBase(BaseModel):
     name: str
@@ -12,6 +14,11 @@ class RoleCreate(RoleBase):
     pass
 
 
+class RoleUpdate(BaseModel):
+    description: Optional[str] = None
+    permissions: Optional[List[Permission]] = None
+
+
 class RoleOut(RoleBase):
     id: int
 
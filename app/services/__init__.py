@@ -3,7 +3,10 @@ from app.services import (
     auth_service,
     book_service,
     borrow_service,
+    export_service,
+    import_service,
     role_service,
+    search_service,
     user_service,
 )
 
@@ -12,6 +15,9 @@ __all__ = [
     "auth_service",
     "book_service",
     "borrow_service",
+    "export_service",
+    "import_service",
     "role_service",
+    "search_service",
     "user_service",
 ]
@@ -1,18 +1,119 @@
-from typing import List
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.core.security import generate_api_key
+from app.core import metrics
+from app.core.cache import build_cache_backend
+from app.core.config import settings
+from app.core.principal import Principal, principal_cache
+from app.core.security import generate_api_key, hash_api_key
 from app.models import APIKey, User
+from app.models.base import utcnow
+from app.schemas.api_key import APIKeyCreate
 
+# generate_api_key() hands out the prefix plus a hex SHA-256 digest.
+_KEY_FORMAT = re.compile(re.escape(settings.API_KEY_PREFIX) + r"[0-9a-f]{64}")
 
-async def create_api_key(db: AsyncSession, user: User, name: str) -> tuple[APIKey, str]:
+
+@dataclass(frozen=True, slots=True)
+class ResolvedAPIKey:
+    key_id: int
+    user_id: int
+    expires_at: Optional[datetime]
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= utcnow()
+
+
+def _dumps(key: ResolvedAPIKey) -> str:
+    expires_at = key.expires_at.isoformat() if key.expires_at else None
+    return json.dumps([key.key_id, key.user_id, expires_at])
+
+
+def _loads(raw: str | bytes) -> ResolvedAPIKey:
+    key_id, user_id, expires_at = json.loads(raw)
+    return ResolvedAPIKey(
+        key_id, user_id, datetime.fromisoformat(expires_at) if expires_at else None
+    )
+
+
+# Keyed by key hash, never the raw key. Unknown hashes live in their own
+# backend so a flood of guesses cannot evict the keys real clients use.
+_keys = build_cache_backend(
+    "api_key",
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+    dumps=_dumps,
+    loads=_loads,
+)
+_unknown_keys = build_cache_backend(
+    "api_key_unknown",
+    max_entries=settings.API_KEY_NEGATIVE_CACHE_MAX_ENTRIES,
+    ttl=settings.API_KEY_NEGATIVE_CACHE_TTL_SECONDS,
+)
+
+
+async def resolve_api_key(db: AsyncSession, raw_key: str) -> Optional[ResolvedAPIKey]:
+    """Look up an active API key, or ``None`` if it is malformed or unknown.
+
+    Expired keys are returned (check ``expired``) so callers can say why they
+    were rejected. A database lookup loads key, user and role in one query
+    and seeds the principal cache, so the caller's ``load_principal`` is free.
+    """
+    if not _KEY_FORMAT.fullmatch(raw_key):
+        metrics.API_KEY_LOOKUPS.labels("malformed").inc()
+        return None
+    key_hash = hash_api_key(raw_key)
+    resolved = await _keys.get(key_hash)
+    if resolved is not None:
+        metrics.API_KEY_LOOKUPS.labels("hit").inc()
+        return resolved
+    if await _unknown_keys.get(key_hash) is not None:
+        metrics.API_KEY_LOOKUPS.labels("negative").inc()
+        return None
+
+    metrics.API_KEY_LOOKUPS.labels("miss").inc()
+    result = await db.execute(
+        select(APIKey)
+        .options(joinedload(APIKey.user).joinedload(User.role))
+        .where(APIKey.key_hash == key_hash, APIKey.is_active.is_(True))
+    )
+    api_key = result.scalar_one_or_none()
+    if api_key is None:
+        await _unknown_keys.set(key_hash, 1)
+        return None
+    resolved = ResolvedAPIKey(api_key.id, api_key.user_id, api_key.expires_at)
+    await _keys.set(key_hash, resolved)
+    await principal_cache.set(Principal.from_user(api_key.user))
+    return resolved
+
+
+def cache_stats() -> dict[str, dict[str, float]]:
+    return {
+        "keys": _keys.stats.as_dict(),
+        "unknown_keys": _unknown_keys.stats.as_dict(),
+    }
+
+
+async def create_api_key(
+    db: AsyncSession, user: Principal, payload: APIKeyCreate
+) -> tuple[APIKey, str]:
     raw_key, key_hash = generate_api_key()
-    api_key = APIKey(name=name, key_hash=key_hash, user_id=user.id)
+    api_key = APIKey(
+        name=payload.name,
+        key_hash=key_hash,
+        user_id=user.id,
+        expires_at=payload.expires_at,
+    )
     db.add(api_key)
     await db.flush()
-    await db.refresh(api_key)
     return api_key, raw_key
 
 
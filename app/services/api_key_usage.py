@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import case, update
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import APIKey
+from app.models.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+class APIKeyUsage:
+    """Write-behind buffer for ``APIKey.last_used_at``.
+
+    Authentication only records the key id in memory; every ``interval``
+    seconds the latest stamp per key is written with one UPDATE per
+    ``BATCH_SIZE`` keys, however many requests each key served. Stamps still
+    pending when the process dies are lost, which is acceptable for a
+    "last used" hint.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._pending: dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.recorded = 0
+        self.flushes = 0
+        self.stamped_total = 0
+        self.errors = 0
+        self.last_flush_at: Optional[float] = None
+
+    def record(self, key_id: int) -> None:
+        self._pending[key_id] = utcnow()
+        self.recorded += 1
+
+    async def flush(self) -> int:
+        """Write pending stamps; return how many keys were stamped."""
+        pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        stamped = 0
+        try:
+            for start in range(0, len(items), BATCH_SIZE):
+                stamps = dict(items[start : start + BATCH_SIZE])
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(APIKey)
+                        .where(APIKey.id.in_(stamps))
+                        # Usage is not a modification of the key.
+                        .values(
+                            last_used_at=case(stamps, value=APIKey.id),
+                            updated_at=APIKey.updated_at,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                stamped += len(stamps)
+        except Exception:
+            # Put back what was not written, keeping any newer stamps.
+            for key_id, stamp in items[stamped:]:
+                self._pending.setdefault(key_id, stamp)
+            raise
+        finally:
+            self.stamped_total += stamped
+        if items:
+            self.flushes += 1
+            self.last_flush_at = time.time()
+        return stamped
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("API key usage flush failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="api-key-usage")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception:
+            self.errors += 1
+            logger.exception("Final API key usage flush failed")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "stamped_total": self.stamped_total,
+            "last_flush_at": self.last_flush_at,
+            "errors": self.errors,
+        }
+
+
+api_key_usage = APIKeyUsage(interval=settings.API_KEY_USAGE_FLUSH_SECONDS)
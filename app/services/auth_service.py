@@ -1,14 +1,19 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal import Principal
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
+    verify_password_async,
 )
-from app.schemas.auth import LoginRequest, RefreshRequest, TokenPair
-from app.services.user_service import get_user_by_username
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, TokenPair
+from app.services.token_revocation import token_revocations
+from app.services.user_service import get_user_by_id, get_user_by_username
 
 
 async def login(db: AsyncSession, payload: LoginRequest) -> TokenPair:
@@ -18,7 +23,10 @@ async def login(db: AsyncSession, payload: LoginRequest) -> TokenPair:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
-    if not verify_password(payload.password, user.hashed_password):
+    # Hand the connection back to the pool while bcrypt runs; logins waiting
+    # on the hashing pool must not starve other requests of connections.
+    await db.commit()
+    if not await verify_password_async(payload.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -29,21 +37,72 @@ async def login(db: AsyncSession, payload: LoginRequest) -> TokenPair:
     return TokenPair(access_token=access, refresh_token=refresh)
 
 
-async def refresh(payload: RefreshRequest) -> TokenPair:
-    decoded = decode_token(payload.refresh_token)
-    if decoded.get("type") != "refresh":
+def _claims(token: str, token_type: str, cache: bool = True) -> Dict[str, Any]:
+    try:
+        claims = decode_token(token, cache=cache)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+    if claims.get("type") != token_type:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token type",
         )
-    user_id = decoded.get("sub")
-    if user_id is None:
+    if any(claims.get(name) is None for name in ("sub", "jti", "exp")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
+    return claims
+
+
+def _expires_at(claims: Dict[str, Any]) -> datetime:
+    return datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+
+
+async def refresh(db: AsyncSession, payload: RefreshRequest) -> TokenPair:
+    """Exchange a refresh token for a new pair, revoking it (rotation).
+
+    Each refresh token works once: a second use, whether a replay of a
+    stolen token or a client retrying, is rejected.
+    """
+    claims = _claims(payload.refresh_token, "refresh", cache=False)
+    user = await get_user_by_id(db, int(claims["sub"]))
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
+    if not await token_revocations.revoke(db, claims["jti"], user.id, _expires_at(claims)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+        )
 
-    access = create_access_token({"sub": str(user_id)})
-    refresh_token = create_refresh_token({"sub": str(user_id)})
+    access = create_access_token({"sub": str(user.id)})
+    refresh_token = create_refresh_token({"sub": str(user.id)})
     return TokenPair(access_token=access, refresh_token=refresh_token)
 
+
+async def logout(
+    db: AsyncSession,
+    user: Principal,
+    access_token: Optional[str],
+    payload: Optional[LogoutRequest],
+) -> None:
+    """Revoke the bearer access token and, if given, the refresh token."""
+    revoked = []
+    if access_token:
+        revoked.append(_claims(access_token, "access"))
+    if payload and payload.refresh_token:
+        claims = _claims(payload.refresh_token, "refresh", cache=False)
+        if claims["sub"] != str(user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Refresh token belongs to another user",
+            )
+        revoked.append(claims)
+    for claims in revoked:
+        await token_revocations.revoke(db, claims["jti"], user.id, _expires_at(claims))
@@ -1,22 +1,207 @@
-from typing import List, Optional
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from fastapi import HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.conditional import Validators
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    Keyset,
+    next_cursor,
+    paginate,
+    resolve_sort,
+)
+from app.core.serialization import row_columns, rows_to_json
+from app.db.session import AsyncSessionLocal
 from app.models import Book
-from app.schemas.book import BookCreate, BookUpdate
+from app.schemas.book import BookCreate, BookOut, BookUpdate
+from app.services.catalog_cache import CachedPage, catalog_cache
+from app.services.search_service import search_backend
 
+DEFAULT_PAGE_SIZE = 100
+BOOK_FIELDS = tuple(BookOut.model_fields)
 
-async def list_books(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Book]:
-    result = await db.execute(select(Book).order_by(Book.id).offset(skip).limit(limit))
+_book_json = TypeAdapter(BookOut)
+
+
+BOOK_SORTS = {
+    "id": Book.id,
+    "title": Book.title,
+    "author": Book.author,
+    "created_at": Book.created_at,
+}
+
+
+def book_keyset(sort: str = "id") -> Keyset:
+    return resolve_sort(sort, BOOK_SORTS, Book.id)
+
+
+async def list_books(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+) -> List[Book]:
+    stmt = paginate(select(Book), keyset or book_keyset(), after, skip, limit)
+    result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
+async def list_book_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+    fields: Sequence[str] = BOOK_FIELDS,
+) -> List[Row]:
+    """``list_books`` as Core rows, for ``rows_to_json``.
+
+    Only the columns behind ``fields`` (a subset of ``BookOut``'s) are
+    selected, plus the keyset columns the next cursor is built from.
+    """
+    keyset = keyset or book_keyset()
+    columns = row_columns(Book, fields, keyset.column, keyset.id_column)
+    result = await db.execute(paginate(select(*columns), keyset, after, skip, limit))
+    return list(result.all())
+
+
+async def catalog_state(db: AsyncSession) -> tuple[int, Optional[datetime]]:
+    """Book count and latest ``updated_at``: the catalog's ETag inputs.
+
+    Both come from indexes, so no book rows are read. Any insert, update or
+    delete (including copy counts moving on checkout/return) changes one of
+    them. ``updated_at`` alone does not move on a delete, so it is not sent
+    as ``Last-Modified``.
+    """
+    result = await db.execute(select(func.count(Book.id), func.max(Book.updated_at)))
+    count, last_modified = result.one()
+    return count, last_modified
+
+
+@dataclass(frozen=True)
+class BookListQuery:
+    """The parameters that identify one ``GET /books`` page."""
+
+    keyset: Keyset
+    skip: int = 0
+    limit: int = DEFAULT_PAGE_SIZE
+    after: Optional[str] = None
+    fields: tuple[str, ...] = BOOK_FIELDS
+
+    @property
+    def params(self) -> tuple:
+        fields = ",".join(self.fields)
+        return (self.keyset.sort, self.skip, self.limit, self.after or "", fields)
+
+    def validators(self, count: int, last_modified: Optional[datetime]) -> Validators:
+        return Validators.build(
+            "books",
+            count,
+            last_modified,
+            *self.params,
+            weak=True,
+        )
+
+
+async def _list_page(
+    db: AsyncSession, query: BookListQuery, validators: Validators
+) -> CachedPage:
+    rows = await list_book_rows(
+        db,
+        skip=query.skip,
+        limit=query.limit,
+        after=query.after,
+        keyset=query.keyset,
+        fields=query.fields,
+    )
+    headers = validators.headers
+    cursor = next_cursor(rows, query.keyset, query.limit)
+    if cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    return CachedPage(body=rows_to_json(rows, query.fields), headers=headers)
+
+
+async def list_books_response(
+    db: AsyncSession, request: Request, query: BookListQuery
+) -> Response:
+    """``GET /books`` served from the catalog cache, falling back to the database.
+
+    A hit costs no queries. On a miss a matching ``If-None-Match`` is still
+    answered from the aggregate validators without reading the page.
+    """
+    if catalog_cache.enabled:
+        version = await catalog_cache.version()
+        key = catalog_cache.list_key(version, query.params)
+        page = await catalog_cache.get(key)
+        if page is not None:
+            return page.response(request)
+
+    validators = query.validators(*await catalog_state(db))
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+    page = await _list_page(db, query, validators)
+    if catalog_cache.enabled:
+        await catalog_cache.put(key, page, version)
+    return page.response(request)
+
+
+async def book_response(db: AsyncSession, request: Request, book_id: int) -> Response:
+    """``GET /books/{id}`` served from the catalog cache, falling back to the database."""
+    key = catalog_cache.book_key(book_id)
+    if catalog_cache.enabled:
+        version = await catalog_cache.version()
+        page = await catalog_cache.get(key)
+        if page is not None:
+            return page.response(request)
+
+    book = await get_book(db, book_id)
+    if not book:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    # updated_at changes with every write to the row, so it identifies
+    # this exact representation.
+    validators = Validators.build(
+        "book", book.id, book.updated_at, last_modified=book.updated_at
+    )
+    page = CachedPage(
+        body=_book_json.dump_json(BookOut.model_validate(book)), headers=validators.headers
+    )
+    if catalog_cache.enabled:
+        await catalog_cache.put(key, page, version)
+    return page.response(request)
+
+
+async def warm_catalog_cache(pages: int) -> None:
+    """Prefill the first ``pages`` pages of the default ``GET /books`` listing.
+
+    Follows each page's next cursor, so clients paging with ``after`` hit
+    the cache as well.
+    """
+    query = BookListQuery(keyset=book_keyset())
+    async with AsyncSessionLocal() as db:
+        version = await catalog_cache.version()
+        state = await catalog_state(db)
+        for _ in range(pages):
+            page = await _list_page(db, query, query.validators(*state))
+            key = catalog_cache.list_key(version, query.params)
+            await catalog_cache.put(key, page, version)
+            after = page.headers.get(NEXT_CURSOR_HEADER)
+            if after is None:
+                break
+            query = replace(query, after=after)
+
+
 async def create_book(db: AsyncSession, payload: BookCreate) -> Book:
     book = Book(**payload.model_dump())
     db.add(book)
     await db.flush()
-    await db.refresh(book)
+    search_backend.index_book_after_commit(db, book)
+    catalog_cache.invalidate_after_commit(db)
     return book
 
 
@@ -36,7 +221,8 @@ async def update_book(
     for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(book, k, v)
     await db.flush()
-    await db.refresh(book)
+    search_backend.index_book_after_commit(db, book)
+    catalog_cache.invalidate_after_commit(db, [book.id])
     return book
 
 
@@ -45,5 +231,7 @@ async def delete_book(db: AsyncSession, book_id: int) -> bool:
     if not book:
         return False
     await db.delete(book)
+    search_backend.remove_book_after_commit(db, book_id)
+    catalog_cache.invalidate_after_commit(db, [book_id])
     return True
 
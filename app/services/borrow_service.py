@@ -1,18 +1,37 @@
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, case, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Keyset, paginate, resolve_sort
 from app.core.permissions import RoleName
-from app.models import Book, Borrow, User
-from app.schemas.borrow import BorrowCreate
+from app.core.principal import Principal
+from app.core.serialization import row_columns
+from app.models import Book, Borrow
+from app.models.borrow import BorrowStatus
+from app.schemas.borrow import (
+    BatchItemResult,
+    BatchResult,
+    BorrowBatchCreate,
+    BorrowCreate,
+    BorrowOut,
+    ReturnBatchRequest,
+)
+from app.services.catalog_cache import catalog_cache
 from fastapi import HTTPException, status
 
 
+def _utcnow() -> datetime:
+    # Naive UTC, which is what the database hands back for these columns, so
+    # responses look the same whether or not the row was reloaded.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 async def borrow_book(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
     payload: BorrowCreate,
 ) -> Borrow:
     if current_user.role and current_user.role.name == RoleName.MEMBER.value:
@@ -20,42 +39,87 @@ async def borrow_book(
     else:
         user_id = payload.user_id or current_user.id
 
-    book_result = await db.execute(select(Book).where(Book.id == payload.book_id))
-    book = book_result.scalar_one_or_none()
-    if not book:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
-    if book.available_copies <= 0:
+    # Claim a copy with a single conditional UPDATE: concurrent checkouts of
+    # the same title serialize on the row inside the database and can never
+    # take available_copies below zero.
+    claimed = await db.execute(
+        update(Book)
+        .where(Book.id == payload.book_id, Book.available_copies > 0)
+        .values(available_copies=Book.available_copies - 1)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount == 0:
+        exists = await db.scalar(select(Book.id).where(Book.id == payload.book_id))
+        if exists is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No copies available")
+    catalog_cache.invalidate_after_commit(db, [payload.book_id])
 
-    now = datetime.now(timezone.utc)
+    now = _utcnow()
     borrow = Borrow(
         user_id=user_id,
         book_id=payload.book_id,
-        status="active",
+        status=BorrowStatus.ACTIVE.value,
         borrowed_at=now,
         due_date=now + timedelta(days=payload.days),
         notes=payload.notes,
     )
-    book.available_copies -= 1
     db.add(borrow)
     await db.flush()
-    await db.refresh(borrow)
     return borrow
 
 
+BORROW_SORTS = {
+    "id": Borrow.id,
+    "due_date": Borrow.due_date,
+    "borrowed_at": Borrow.borrowed_at,
+}
+
+
+def borrow_keyset(sort: str = "id") -> Keyset:
+    return resolve_sort(sort, BORROW_SORTS, Borrow.id)
+
+
+def _visible_borrows(stmt, current_user: Principal):
+    if current_user.role and current_user.role.name == RoleName.MEMBER.value:
+        stmt = stmt.where(Borrow.user_id == current_user.id)
+    return stmt
+
+
 async def list_borrows(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
 ) -> List[Borrow]:
-    stmt = select(Borrow).order_by(Borrow.id).offset(skip).limit(limit)
-    if current_user.role and current_user.role.name == RoleName.MEMBER.value:
-        stmt = stmt.where(Borrow.user_id == current_user.id)
+    stmt = _visible_borrows(select(Borrow), current_user)
+    stmt = paginate(stmt, keyset or borrow_keyset(), after, skip, limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
+BORROW_FIELDS = tuple(BorrowOut.model_fields)
+
+
+async def list_borrow_rows(
+    db: AsyncSession,
+    current_user: Principal,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+    fields: Sequence[str] = BORROW_FIELDS,
+) -> List[Row]:
+    """``list_borrows`` as Core rows of the ``fields`` columns, for ``rows_to_json``."""
+    keyset = keyset or borrow_keyset()
+    columns = row_columns(Borrow, fields, keyset.column, keyset.id_column)
+    stmt = _visible_borrows(select(*columns), current_user)
+    result = await db.execute(paginate(stmt, keyset, after, skip, limit))
+    return list(result.all())
+
+
 async def get_borrow(db: AsyncSession, borrow_id: int) -> Optional[Borrow]:
     result = await db.execute(select(Borrow).where(Borrow.id == borrow_id))
     return result.scalar_one_or_none()
@@ -63,7 +127,7 @@ async def get_borrow(db: AsyncSession, borrow_id: int) -> Optional[Borrow]:
 
 async def return_borrow(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
     borrow_id: int,
 ) -> Borrow:
     borrow = await get_borrow(db, borrow_id)
@@ -74,17 +138,215 @@ async def return_borrow(
         if borrow.user_id != current_user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    if borrow.returned_at is not None or borrow.status == "returned":
+    if borrow.returned_at is not None or borrow.status == BorrowStatus.RETURNED:
         return borrow
 
-    book_result = await db.execute(select(Book).where(Book.id == borrow.book_id))
-    book = book_result.scalar_one_or_none()
-    if book:
-        book.available_copies += 1
+    # The status guard makes the transition happen once even if the same
+    # borrow is returned concurrently; only the winner gives the copy back.
+    returned = await db.execute(
+        update(Borrow)
+        .where(Borrow.id == borrow_id, Borrow.status != BorrowStatus.RETURNED.value)
+        .values(
+            status=BorrowStatus.RETURNED.value,
+            returned_at=_utcnow(),
+        )
+    )
+    if returned.rowcount == 0:
+        await db.refresh(borrow)
+        return borrow
 
-    borrow.status = "returned"
-    borrow.returned_at = datetime.now(timezone.utc)
-    await db.flush()
-    await db.refresh(borrow)
+    await db.execute(
+        update(Book)
+        .where(Book.id == borrow.book_id)
+        .values(available_copies=Book.available_copies + 1)
+        .execution_options(synchronize_session=False)
+    )
+    catalog_cache.invalidate_after_commit(db, [borrow.book_id])
     return borrow
 
+
+async def mark_overdue(
+    db: AsyncSession, limit: int, now: Optional[datetime] = None
+) -> int:
+    """Flag up to ``limit`` active borrows past their due date as overdue.
+
+    Candidates come from the (status, due_date) index, and the update touches
+    only those primary keys, so each call locks at most ``limit`` rows.
+    """
+    now = now or _utcnow()
+    ids = (
+        await db.execute(
+            select(Borrow.id)
+            .where(Borrow.status == BorrowStatus.ACTIVE.value, Borrow.due_date < now)
+            .order_by(Borrow.due_date)
+            .limit(limit)
+        )
+    ).scalars().all()
+    if not ids:
+        return 0
+    result = await db.execute(
+        update(Borrow)
+        .where(Borrow.id.in_(ids), Borrow.status == BorrowStatus.ACTIVE.value)
+        .values(status=BorrowStatus.OVERDUE.value)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _batch_result(items: List[BatchItemResult]) -> BatchResult:
+    succeeded = sum(1 for item in items if item.status_code < 400)
+    return BatchResult(succeeded=succeeded, failed=len(items) - succeeded, items=items)
+
+
+async def _insert_borrows(db: AsyncSession, rows: List[dict]) -> List[Tuple[int, int]]:
+    """Insert ``rows`` in one statement and return their ``(id, book_id)``."""
+    statement = insert(Borrow).values(rows)
+    if db.get_bind().dialect.insert_returning:
+        return list(await db.execute(statement.returning(Borrow.id, Borrow.book_id)))
+    # MySQL: no RETURNING, but a multi-row INSERT gets consecutive ids starting
+    # at LAST_INSERT_ID(), in VALUES order (InnoDB allocates them up front).
+    result = await db.execute(statement)
+    ids = range(result.lastrowid, result.lastrowid + result.rowcount)
+    return [(borrow_id, row["book_id"]) for borrow_id, row in zip(ids, rows)]
+
+
+async def borrow_books_batch(
+    db: AsyncSession,
+    current_user: Principal,
+    payload: BorrowBatchCreate,
+) -> BatchResult:
+    """Check out several books in one transaction with a fixed number of statements.
+
+    Rows are locked once, all decrements go out as a single CASE update and
+    the borrows as one multi-row insert. Items that cannot be satisfied are
+    reported individually instead of failing the batch.
+    """
+    if current_user.role and current_user.role.name == RoleName.MEMBER.value:
+        user_id = current_user.id
+    else:
+        user_id = payload.user_id or current_user.id
+
+    requested = sorted(set(payload.book_ids))
+    available = dict(
+        (
+            await db.execute(
+                select(Book.id, Book.available_copies)
+                .where(Book.id.in_(requested))
+                .order_by(Book.id)
+                .with_for_update()
+            )
+        ).all()
+    )
+
+    claimed: Counter[int] = Counter()
+    outcomes: List[Optional[BatchItemResult]] = []
+    for book_id in payload.book_ids:
+        if book_id not in available:
+            outcomes.append(
+                BatchItemResult(id=book_id, status_code=404, detail="Book not found")
+            )
+        elif available[book_id] - claimed[book_id] <= 0:
+            outcomes.append(
+                BatchItemResult(id=book_id, status_code=409, detail="No copies available")
+            )
+        else:
+            claimed[book_id] += 1
+            outcomes.append(None)
+
+    if claimed:
+        await db.execute(
+            update(Book)
+            .where(Book.id.in_(list(claimed)))
+            .values(
+                available_copies=Book.available_copies
+                - case(claimed, value=Book.id, else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        catalog_cache.invalidate_after_commit(db, claimed)
+        # MySQL DATETIME has second precision; use a whole-second timestamp
+        # so the response matches what is stored.
+        now = _utcnow().replace(microsecond=0)
+        common = {
+            "user_id": user_id,
+            "status": BorrowStatus.ACTIVE.value,
+            "borrowed_at": now,
+            "due_date": now + timedelta(days=payload.days),
+            "notes": payload.notes,
+        }
+        rows = [{**common, "book_id": book_id} for book_id in claimed.elements()]
+        # Rows for the same book differ only by id, so which goes where is moot.
+        by_book: dict[int, deque[BorrowOut]] = defaultdict(deque)
+        for borrow_id, book_id in await _insert_borrows(db, rows):
+            by_book[book_id].append(BorrowOut(id=borrow_id, book_id=book_id, **common))
+
+    items = []
+    for book_id, outcome in zip(payload.book_ids, outcomes):
+        if outcome is None:
+            borrow = by_book[book_id].popleft()
+            outcome = BatchItemResult(id=book_id, status_code=201, borrow=borrow)
+        items.append(outcome)
+    return _batch_result(items)
+
+
+async def return_borrows_batch(
+    db: AsyncSession,
+    current_user: Principal,
+    payload: ReturnBatchRequest,
+) -> BatchResult:
+    """Return several borrows in one transaction with at most three statements."""
+    is_member = bool(
+        current_user.role and current_user.role.name == RoleName.MEMBER.value
+    )
+    result = await db.execute(
+        select(Borrow)
+        .where(Borrow.id.in_(sorted(set(payload.borrow_ids))))
+        .order_by(Borrow.id)
+        .with_for_update()
+    )
+    borrows = {borrow.id: borrow for borrow in result.scalars()}
+
+    to_return: dict[int, Borrow] = {}
+    errors: dict[int, BatchItemResult] = {}
+    for borrow_id in payload.borrow_ids:
+        borrow = borrows.get(borrow_id)
+        if borrow is None:
+            errors[borrow_id] = BatchItemResult(
+                id=borrow_id, status_code=404, detail="Borrow not found"
+            )
+        elif is_member and borrow.user_id != current_user.id:
+            errors[borrow_id] = BatchItemResult(
+                id=borrow_id, status_code=403, detail="Forbidden"
+            )
+        elif borrow.returned_at is None and borrow.status != BorrowStatus.RETURNED:
+            to_return[borrow_id] = borrow
+
+    if to_return:
+        await db.execute(
+            update(Borrow)
+            .where(Borrow.id.in_(list(to_return)))
+            .values(status=BorrowStatus.RETURNED.value, returned_at=_utcnow())
+        )
+        copies = Counter(borrow.book_id for borrow in to_return.values())
+        await db.execute(
+            update(Book)
+            .where(Book.id.in_(list(copies)))
+            .values(
+                available_copies=Book.available_copies
+                + case(copies, value=Book.id, else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        catalog_cache.invalidate_after_commit(db, copies)
+
+    # Built after the updates so returned items reflect their new state.
+    items = [
+        errors.get(borrow_id)
+        or BatchItemResult(
+            id=borrow_id,
+            status_code=200,
+            borrow=BorrowOut.model_validate(borrows[borrow_id]),
+        )
+        for borrow_id in payload.borrow_ids
+    ]
+    return _batch_result(items)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CacheBackend, CacheStats, build_cache_backend
+from app.core.conditional import Validators
+from app.core.config import settings
+from app.db.replicas import replica_router
+from app.db.session import after_commit
+
+VERSION_KEY = "catalog"
+# Outlives any page by far; if it is lost anyway a fresh version is minted,
+# which only orphans the existing pages.
+VERSION_TTL_SECONDS = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPage:
+    """A serialized catalog response body plus the headers it is sent with."""
+
+    body: bytes
+    headers: dict[str, str]
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def dumps(self) -> bytes:
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> CachedPage:
+        headers, _, body = raw.partition(b"\n")
+        return cls(body=body, headers=json.loads(headers))
+
+    def response(self, request: Request) -> Response:
+        validators = Validators.from_headers(self.headers)
+        if validators.not_modified(request):
+            return validators.not_modified_response()
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+
+def _new_version(changed_at: float = 0.0) -> str:
+    return f"{changed_at:.6f}:{secrets.token_hex(4)}"
+
+
+def _changed_at(version: str) -> float:
+    return float(version.partition(":")[0])
+
+
+class CatalogCache:
+    """Serialized ``GET /books`` pages and ``GET /books/{id}`` bodies.
+
+    List pages are stored under the current catalog version, so a single
+    version bump retires all of them; single books are dropped by id. Writers
+    invalidate through ``invalidate_after_commit``, so a read running
+    alongside the write cannot put the old rows back once it has committed.
+    """
+
+    def __init__(self, pages: CacheBackend, versions: CacheBackend, enabled: bool) -> None:
+        self.pages = pages
+        self.versions = versions
+        self.enabled = enabled
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.pages.stats
+
+    async def version(self) -> str:
+        version = await self.versions.get(VERSION_KEY)
+        if version is None:
+            version = _new_version()
+            await self.versions.set(VERSION_KEY, version)
+        return version
+
+    @staticmethod
+    def list_key(version: str, params: tuple) -> str:
+        return ":".join(map(str, ("list", version, *params)))
+
+    @staticmethod
+    def book_key(book_id: int) -> str:
+        return f"book:{book_id}"
+
+    async def get(self, key: str) -> CachedPage | None:
+        return await self.pages.get(key)
+
+    async def put(self, key: str, page: CachedPage, version: str) -> None:
+        """Store ``page``, built from data read under ``version``.
+
+        Pages are dropped if the catalog changed while they were being built,
+        or so recently that a lagging replica may have served the old rows.
+        """
+        current = await self.version()
+        if current != version:
+            return
+        if (
+            replica_router.enabled
+            and time.time() - _changed_at(current) < settings.DB_REPLICA_MAX_LAG_SECONDS
+        ):
+            return
+        await self.pages.set(key, page)
+
+    async def invalidate(self, book_ids: Iterable[int] = ()) -> None:
+        """Retire every list page plus the entries of ``book_ids``."""
+        await self.versions.set(VERSION_KEY, _new_version(time.time()))
+        for book_id in set(book_ids):
+            await self.pages.delete(self.book_key(book_id))
+
+    def invalidate_after_commit(self, db: AsyncSession, book_ids: Iterable[int] = ()) -> None:
+        if not self.enabled:
+            return
+        book_ids = tuple(book_ids)
+        after_commit(db, lambda: self.invalidate(book_ids))
+
+
+catalog_cache = CatalogCache(
+    pages=build_cache_backend(
+        "catalog",
+        max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+        ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+        dumps=CachedPage.dumps,
+        loads=CachedPage.loads,
+        max_size=settings.CATALOG_CACHE_MAX_BYTES,
+        sizeof=lambda page: page.size,
+    ),
+    versions=build_cache_backend(
+        "catalog_version", max_entries=1, ttl=VERSION_TTL_SECONDS
+    ),
+    enabled=settings.CATALOG_CACHE_ENABLED,
+)
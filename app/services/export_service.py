@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.core.config import settings
+from app.core.permissions import RoleName
+from app.core.principal import Principal
+from app.db.session import read_session
+from app.models import Book, Borrow, Role, User
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> Any:
+    # orjson handles dates and datetimes itself.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def books_query(genre: Optional[str] = None) -> Select:
+    stmt = select(
+        Book.id,
+        Book.isbn,
+        Book.title,
+        Book.author,
+        Book.publisher,
+        Book.genre,
+        Book.description,
+        Book.total_copies,
+        Book.available_copies,
+        Book.published_year,
+        Book.created_at,
+        Book.updated_at,
+    ).order_by(Book.id)
+    if genre is not None:
+        stmt = stmt.where(Book.genre == genre)
+    return stmt
+
+
+def borrows_query(
+    current_user: Principal,
+    status: Optional[str] = None,
+    borrowed_from: Optional[datetime] = None,
+    borrowed_to: Optional[datetime] = None,
+) -> Select:
+    stmt = select(
+        Borrow.id,
+        Borrow.user_id,
+        Borrow.book_id,
+        Borrow.status,
+        Borrow.borrowed_at,
+        Borrow.due_date,
+        Borrow.returned_at,
+        Borrow.notes,
+    ).order_by(Borrow.id)
+    if current_user.role and current_user.role.name == RoleName.MEMBER.value:
+        stmt = stmt.where(Borrow.user_id == current_user.id)
+    if status is not None:
+        stmt = stmt.where(Borrow.status == status)
+    if borrowed_from is not None:
+        stmt = stmt.where(Borrow.borrowed_at >= borrowed_from)
+    if borrowed_to is not None:
+        stmt = stmt.where(Borrow.borrowed_at < borrowed_to)
+    return stmt
+
+
+def users_query(is_active: Optional[bool] = None) -> Select:
+    stmt = (
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.full_name,
+            User.is_active,
+            User.role_id,
+            Role.name.label("role"),
+            User.created_at,
+        )
+        .join(Role, Role.id == User.role_id)
+        .order_by(User.id)
+    )
+    if is_active is not None:
+        stmt = stmt.where(User.is_active.is_(is_active))
+    return stmt
+
+
+async def stream_export(stmt: Select, fmt: str) -> AsyncIterator[bytes]:
+    """Yield ``stmt``'s rows as NDJSON or CSV, one buffered batch at a time.
+
+    Rows come from a server-side cursor as plain Core rows, so neither the
+    ORM identity map nor a full result list is ever built. The export uses
+    its own (replica, when configured) session because it outlives the
+    request handler.
+    """
+    batch_size = settings.EXPORT_BATCH_SIZE
+    async with await read_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(columns)
+
+        async for partition in result.partitions(batch_size):
+            if writer is None:
+                yield b"".join(
+                    orjson.dumps(
+                        dict(zip(columns, row)),
+                        default=_json_default,
+                        option=orjson.OPT_APPEND_NEWLINE,
+                    )
+                    for row in partition
+                )
+                continue
+            writer.writerows(partition)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+
+def export_response(stmt: Select, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Book
+from app.models.base import utcnow
+from app.schemas.book import BookCreate, BookImportResult, ImportRowError
+from app.services.catalog_cache import catalog_cache
+from app.services.search_service import search_backend
+
+logger = logging.getLogger(__name__)
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    row = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row, exc
+
+
+class _NeedMore(Exception):
+    """The buffered lines end inside a quoted field."""
+
+
+def _then_need_more(lines: List[str]) -> Iterator[str]:
+    for line in lines:
+        yield line + "\n"
+    raise _NeedMore
+
+
+class _CSVRecords:
+    """Splits physical lines into CSV records with ``csv.reader``.
+
+    A quoted field may span lines, so lines are buffered until the reader
+    can finish the record. A malformed record, or one still open after
+    ``max_bytes`` or at the end of the input, is reported as one error and
+    the lines after its first are parsed again, so a stray quote costs one
+    row rather than the rest of the file.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lines: List[str] = []
+        self._size = 0
+
+    def feed(self, lines: Iterable[str], final: bool = False) -> Iterator[Any]:
+        """Yield each completed record's fields, or a ``ValueError`` for a bad one."""
+        pending = deque(lines)
+        while pending or (final and self._lines):
+            if not pending:
+                error = self._unterminated()
+            else:
+                line = pending.popleft()
+                if not self._lines and not line.strip():
+                    continue
+                self._lines.append(line)
+                self._size += len(line) + 1
+                try:
+                    reader = csv.reader(_then_need_more(self._lines), strict=True)
+                    fields = next(reader)
+                except _NeedMore:
+                    if self._size <= self.max_bytes and (pending or not final):
+                        continue
+                    error = self._unterminated()
+                except csv.Error as exc:
+                    error = str(exc)
+                else:
+                    self._reset()
+                    yield fields
+                    continue
+            yield ValueError(error)
+            pending.extendleft(reversed(self._lines[1:]))
+            self._reset()
+
+    def _unterminated(self) -> str:
+        return f"unterminated quoted field (gave up after {len(self._lines)} lines)"
+
+    def _reset(self) -> None:
+        self._lines = []
+        self._size = 0
+
+
+async def _iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    header: List[str] | None = None
+    row = 0
+    records = _CSVRecords(settings.IMPORT_MAX_RECORD_BYTES)
+
+    def number(batch: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+        nonlocal header, row
+        for values in batch:
+            if header is None:
+                if isinstance(values, Exception):
+                    yield 0, values
+                else:
+                    header = [h.strip() for h in values]
+                continue
+            row += 1
+            if isinstance(values, Exception):
+                yield row, values
+            elif len(values) != len(header):
+                yield row, ValueError(
+                    f"expected {len(header)} columns, got {len(values)}"
+                )
+            else:
+                # Empty cells mean "not provided" so schema defaults apply.
+                yield row, {k: v for k, v in zip(header, values) if v != ""}
+
+    async for line in _iter_lines(chunks):
+        for item in number(records.feed([line])):
+            yield item
+    for item in number(records.feed((), final=True)):
+        yield item
+
+
+_PLAIN_UPDATE_COLUMNS = (
+    "title",
+    "author",
+    "publisher",
+    "genre",
+    "description",
+    "published_year",
+)
+
+
+def _adjusted_available(new_total):
+    return Book.available_copies + new_total - Book.total_copies
+
+
+def _upsert_statement(
+    db: AsyncSession, rows: List[Dict[str, Any]], columns: FrozenSet[str]
+):
+    """Insert ``rows``; on existing ISBNs update only the supplied ``columns``."""
+    plain = [col for col in _PLAIN_UPDATE_COLUMNS if col in columns]
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(Book).values(rows)
+        new = stmt.inserted
+        assignments = []
+        if "total_copies" in columns:
+            # MySQL applies assignments left to right, so available_copies must
+            # be adjusted while total_copies still holds the old value.
+            assignments += [
+                ("available_copies", _adjusted_available(new.total_copies)),
+                ("total_copies", new.total_copies),
+            ]
+        assignments += [(col, getattr(new, col)) for col in plain]
+        assignments.append(("updated_at", utcnow()))
+        return stmt.on_duplicate_key_update(assignments)
+    stmt = sqlite_insert(Book).values(rows)
+    new = stmt.excluded
+    assignments = {}
+    if "total_copies" in columns:
+        assignments["available_copies"] = _adjusted_available(new.total_copies)
+        assignments["total_copies"] = new.total_copies
+    assignments.update({col: getattr(new, col) for col in plain})
+    assignments["updated_at"] = utcnow()
+    return stmt.on_conflict_do_update(index_elements=[Book.isbn], set_=assignments)
+
+
+async def _flush_chunk(
+    db: AsyncSession, chunk: Dict[str, Tuple[int, BookCreate]], result: BookImportResult
+) -> bool:
+    """Upsert and commit ``chunk``; roll back and return False on a database error."""
+    rejected = result.rejected
+    try:
+        # Locked so a concurrent checkout cannot invalidate the on-loan check below.
+        existing = {
+            isbn: (book_id, total, available)
+            for isbn, book_id, total, available in (
+                await db.execute(
+                    select(Book.isbn, Book.id, Book.total_copies, Book.available_copies)
+                    .where(Book.isbn.in_(list(chunk)))
+                    .with_for_update()
+                )
+            ).all()
+        }
+        # Rows are grouped by the columns they supplied: one statement per group.
+        groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+        updated_ids = []
+        for isbn, (row, book) in chunk.items():
+            supplied = frozenset(book.model_dump(exclude_unset=True))
+            if isbn in existing:
+                book_id, total, available = existing[isbn]
+                if "total_copies" in supplied and available + book.total_copies < total:
+                    _reject(
+                        result,
+                        row,
+                        isbn,
+                        f"total_copies: {total - available} copies are on loan",
+                    )
+                    continue
+                updated_ids.append(book_id)
+            # Defaults only matter for new books; existing ones keep unsupplied columns.
+            groups.setdefault(supplied, []).append(book.model_dump())
+        for columns, rows in groups.items():
+            await db.execute(_upsert_statement(db, rows, columns))
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        rows = sorted(row for row, _ in chunk.values())
+        logger.exception("Import chunk (rows %d-%d) failed", rows[0], rows[-1])
+        result.failed += len(chunk) - (result.rejected - rejected)
+        result.error = (
+            f"Database error writing rows {rows[0]}-{rows[-1]}; they were not"
+            " imported and the import stopped there"
+        )
+        return False
+    # The chunk is committed here rather than by the request, so invalidate
+    # straight away instead of after the final commit.
+    if catalog_cache.enabled:
+        await catalog_cache.invalidate(updated_ids)
+    result.updated += len(updated_ids)
+    result.inserted += sum(map(len, groups.values())) - len(updated_ids)
+    return True
+
+
+def _reject(result: BookImportResult, row: int, isbn: Any, detail: str) -> None:
+    result.rejected += 1
+    if len(result.errors) < settings.IMPORT_MAX_ERRORS:
+        result.errors.append(
+            ImportRowError(
+                row=row, isbn=None if isbn is None else str(isbn), detail=detail
+            )
+        )
+    else:
+        result.errors_truncated = True
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors()
+        )
+    return str(exc)
+
+
+async def import_books(
+    db: AsyncSession, chunks: AsyncIterator[bytes], fmt: str
+) -> BookImportResult:
+    """Upsert books by ISBN from a streamed CSV or NDJSON body.
+
+    Rows are validated against ``BookCreate`` and written in chunks of
+    ``IMPORT_CHUNK_SIZE``; each chunk is committed on its own, so memory use
+    does not grow with the file. A database error rolls back the current
+    chunk and ends the import; earlier chunks stay committed and the result
+    reports how far it got.
+    Existing books only get the columns the row supplied, and keep their
+    loans: ``available_copies`` moves by the change in ``total_copies``
+    instead of being overwritten, and a row that would take it below zero is
+    rejected.
+    """
+    result = BookImportResult()
+    records = _iter_csv(chunks) if fmt == "csv" else _iter_ndjson(chunks)
+    chunk: Dict[str, Tuple[int, BookCreate]] = {}
+
+    async for row, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("row must be an object")
+            book = BookCreate.model_validate(record)
+        except (ValidationError, ValueError) as exc:
+            isbn = record.get("isbn") if isinstance(record, dict) else None
+            _reject(result, row, isbn, _describe(exc))
+            continue
+
+        if book.isbn in chunk:
+            # The same ISBN twice in one chunk: the later row wins.
+            result.superseded += 1
+        chunk[book.isbn] = (row, book)
+        if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            if not await _flush_chunk(db, chunk, result):
+                chunk = {}
+                break
+            chunk = {}
+
+    if chunk:
+        await _flush_chunk(db, chunk, result)
+    if result.inserted or result.updated:
+        search_backend.reset()
+    return result
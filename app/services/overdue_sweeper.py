@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.services import borrow_service
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "lms_overdue_sweeper"
+
+
+class LeaderLock:
+    """Non-blocking lock that lets one process out of many run the sweeper.
+
+    On MySQL this is ``GET_LOCK`` held by a dedicated connection, so the lock
+    is released automatically if the leader dies. Other databases fall back to
+    an exclusive ``flock`` on a file, which covers workers on one host.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str = LOCK_NAME) -> None:
+        self.engine = engine
+        self.name = name
+        self._conn: Optional[AsyncConnection] = None
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None or self._file is not None
+
+    async def acquire(self) -> bool:
+        """Take the lock if it is free; return whether this process holds it."""
+        if self.engine.dialect.name == "mysql":
+            return await self._acquire_mysql()
+        return self._acquire_file()
+
+    async def _acquire_mysql(self) -> bool:
+        if self._conn is not None:
+            try:
+                owner = await self._conn.scalar(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"),
+                    {"name": self.name},
+                )
+                if owner:
+                    return True
+            except Exception:
+                logger.warning("Lost overdue sweeper lock connection", exc_info=True)
+            await self._close_connection()
+
+        conn = await self.engine.connect()
+        try:
+            got = await conn.scalar(
+                text("SELECT GET_LOCK(:name, 0)"), {"name": self.name}
+            )
+        except Exception:
+            await conn.close()
+            raise
+        if got == 1:
+            self._conn = conn
+            return True
+        await conn.close()
+        return False
+
+    def _acquire_file(self) -> bool:
+        if self._file is not None:
+            return True
+        try:
+            import fcntl
+        except ImportError:  # no flock (Windows): assume a single worker
+            return True
+        path = Path(tempfile.gettempdir()) / f"{self.name}.lock"
+        handle = open(path, "a+")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._file = handle
+        return True
+
+    async def _close_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    async def release(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.execute(
+                    text("SELECT RELEASE_LOCK(:name)"), {"name": self.name}
+                )
+            except Exception:
+                pass
+            await self._close_connection()
+        if self._file is not None:
+            self._file.close()  # closing the descriptor drops the flock
+            self._file = None
+
+
+class OverdueSweeper:
+    """Background task that moves active borrows past their due date to overdue.
+
+    Every ``interval`` seconds the leader process flags overdue borrows in
+    batches of ``batch_size``, committing after each batch so no transaction
+    holds more than one batch of row locks.
+    """
+
+    def __init__(self, interval: float, batch_size: int, lock: LeaderLock) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lock = lock
+        self._task: Optional[asyncio.Task] = None
+
+        self.runs = 0
+        self.batches = 0
+        self.transitioned_total = 0
+        self.errors = 0
+        self.last_transitioned = 0
+        self.last_run_at: Optional[float] = None
+        self.last_duration_seconds = 0.0
+
+    async def sweep(self) -> int:
+        """Run batches until no overdue active borrows remain; return rows flagged."""
+        start = time.perf_counter()
+        flagged = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                count = await borrow_service.mark_overdue(db, self.batch_size)
+                await db.commit()
+            self.batches += 1
+            flagged += count
+            metrics.OVERDUE_BORROWS_MARKED.inc(count)
+            if count < self.batch_size:
+                break
+            await asyncio.sleep(0)  # let requests in between batches
+
+        self.runs += 1
+        self.transitioned_total += flagged
+        self.last_transitioned = flagged
+        self.last_run_at = time.time()
+        self.last_duration_seconds = time.perf_counter() - start
+        metrics.OVERDUE_SWEEP_DURATION.observe(self.last_duration_seconds)
+        return flagged
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.lock.acquire():
+                    flagged = await self.sweep()
+                    if flagged:
+                        logger.info("Marked %d borrows overdue", flagged)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Overdue sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="overdue-sweeper")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.lock.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "leader": self.lock.held,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "batches": self.batches,
+            "transitioned_total": self.transitioned_total,
+            "last_transitioned": self.last_transitioned,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": round(self.last_duration_seconds * 1000, 3),
+            "errors": self.errors,
+        }
+
+
+overdue_sweeper = OverdueSweeper(
+    interval=settings.OVERDUE_SWEEPER_INTERVAL_SECONDS,
+    batch_size=settings.OVERDUE_SWEEPER_BATCH_SIZE,
+    lock=LeaderLock(engine),
+)
@@ -1,13 +1,32 @@
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import Keyset, paginate, resolve_sort
+from app.core.permissions import role_permission_table
+from app.core.principal import principal_cache
+from app.db.session import after_commit
 from app.models import Role
+from app.services.user_service import invalidate_role_cache
 
 
-async def list_roles(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Role]:
-    result = await db.execute(select(Role).order_by(Role.id).offset(skip).limit(limit))
+ROLE_SORTS = {"id": Role.id, "name": Role.name}
+
+
+def role_keyset(sort: str = "id") -> Keyset:
+    return resolve_sort(sort, ROLE_SORTS, Role.id)
+
+
+async def list_roles(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+) -> List[Role]:
+    stmt = paginate(select(Role), keyset or role_keyset(), after, skip, limit)
+    result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
@@ -22,5 +41,29 @@ async def create_role(
     role = Role(name=name, description=description, permissions=permissions)
     db.add(role)
     await db.flush()
-    await db.refresh(role)
+    return role
+
+
+async def update_role(
+    db: AsyncSession,
+    role_id: int,
+    description: str | None = None,
+    permissions: str | None = None,
+) -> Role | None:
+    role = await get_role(db, role_id)
+    if not role:
+        return None
+    if description is not None:
+        role.description = description
+    if permissions is not None:
+        role.permissions = permissions
+    await db.flush()
+
+    # Not before the commit: a concurrent request would reload the old row.
+    async def invalidate() -> None:
+        role_permission_table.invalidate(role_id)
+        invalidate_role_cache()
+        await principal_cache.invalidate_role(role_id)
+
+    after_commit(db, invalidate)
     return role
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import after_commit, engine
+from app.models import Book
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Relative weight of a term occurring in each indexed field.
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "description": 1.0}
+# Ranked ids checked against the filters per statement.
+FILTER_BATCH_SIZE = 500
+
+
+def tokenize(text: str | None) -> List[str]:
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1]
+
+
+@dataclass
+class BookSearchFilters:
+    genre: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    available_only: bool = False
+
+    @property
+    def active(self) -> bool:
+        return (
+            self.genre is not None
+            or self.year_from is not None
+            or self.year_to is not None
+            or self.available_only
+        )
+
+    def apply(self, stmt: Select) -> Select:
+        if self.genre is not None:
+            stmt = stmt.where(Book.genre == self.genre)
+        if self.year_from is not None:
+            stmt = stmt.where(Book.published_year >= self.year_from)
+        if self.year_to is not None:
+            stmt = stmt.where(Book.published_year <= self.year_to)
+        if self.available_only:
+            stmt = stmt.where(Book.available_copies > 0)
+        return stmt
+
+
+class SearchBackend(ABC):
+    @abstractmethod
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        filters: BookSearchFilters,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> List[Book]: ...
+
+    def index_book(self, book: Book) -> None:
+        """Add or replace ``book`` in the index (no-op for database-side indexes)."""
+
+    def remove_book(self, book_id: int) -> None:
+        """Drop ``book_id`` from the index (no-op for database-side indexes)."""
+
+    def reset(self) -> None:
+        """Discard the index after bulk changes (no-op for database-side indexes)."""
+
+    def index_book_after_commit(self, db: AsyncSession, book: Book) -> None:
+        """``index_book`` once ``db`` commits; a rollback leaves the index alone."""
+
+        async def index() -> None:
+            self.index_book(book)
+
+        after_commit(db, index)
+
+    def remove_book_after_commit(self, db: AsyncSession, book_id: int) -> None:
+        """``remove_book`` once ``db`` commits; a rollback leaves the index alone."""
+
+        async def remove() -> None:
+            self.remove_book(book_id)
+
+        after_commit(db, remove)
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """Ranks with ``MATCH ... AGAINST`` over the books FULLTEXT index."""
+
+    async def search(self, db, q, filters, skip=0, limit=20):
+        relevance = match(Book.title, Book.author, Book.description, against=q)
+        stmt = (
+            filters.apply(select(Book).where(relevance))
+            .order_by(relevance.desc(), Book.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+
+class InvertedIndexBackend(SearchBackend):
+    """In-process BM25 index for SQLite and test deployments.
+
+    Built from the database on first search and then kept current by
+    ``book_service``. Each process holds its own copy, so it is not meant for
+    multi-worker deployments.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self) -> None:
+        self.built = False
+        self._build_lock = asyncio.Lock()
+        self._building = False
+        # Bumped by ``reset``, so a build that overlapped one starts over.
+        self._generation = 0
+        # Changes committed while building: (book id, fields, or None if removed).
+        self._missed: List[Tuple[int, Optional[tuple]]] = []
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._doc_length: Dict[int, float] = {}
+        self._total_length = 0.0
+
+    async def _build(self, db: AsyncSession) -> None:
+        async with self._build_lock:
+            while not self.built:
+                self._clear()
+                generation = self._generation
+                self._building = True
+                try:
+                    result = await db.stream(
+                        select(Book.id, Book.title, Book.author, Book.description)
+                    )
+                    async for row in result:
+                        self._add(row.id, row.title, row.author, row.description)
+                finally:
+                    self._building = False
+                if generation != self._generation:
+                    continue
+                # The stream may or may not have seen these; replaying them in
+                # commit order leaves the index as the database is now.
+                for book_id, fields in self._missed:
+                    self._remove(book_id)
+                    if fields is not None:
+                        self._add(book_id, *fields)
+                self._missed.clear()
+                self.built = True
+
+    def _add(self, book_id: int, title, author, description) -> None:
+        weighted: Counter[str] = Counter()
+        fields = {"title": title, "author": author, "description": description}
+        for field, text in fields.items():
+            for term in tokenize(text):
+                weighted[term] += FIELD_WEIGHTS[field]
+        for term, tf in weighted.items():
+            self._postings[term][book_id] = tf
+        self._doc_terms[book_id] = list(weighted)
+        length = sum(weighted.values())
+        self._doc_length[book_id] = length
+        self._total_length += length
+
+    def _remove(self, book_id: int) -> None:
+        for term in self._doc_terms.pop(book_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(book_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_length.pop(book_id, 0.0)
+
+    def index_book(self, book: Book) -> None:
+        fields = (book.title, book.author, book.description)
+        if self.built:
+            self._remove(book.id)
+            self._add(book.id, *fields)
+        elif self._building:
+            self._missed.append((book.id, fields))
+
+    def remove_book(self, book_id: int) -> None:
+        if self.built:
+            self._remove(book_id)
+        elif self._building:
+            self._missed.append((book_id, None))
+
+    def reset(self) -> None:
+        # Rebuilt from the database on the next search.
+        self.built = False
+        self._generation += 1
+        self._clear()
+
+    def _clear(self) -> None:
+        self._missed.clear()
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_length.clear()
+        self._total_length = 0.0
+
+    def score(self, q: str) -> Dict[int, float]:
+        n_docs = len(self._doc_length)
+        if not n_docs:
+            return {}
+        avg_length = self._total_length / n_docs or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(q)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for book_id, tf in postings.items():
+                norm = 1 - self.b + self.b * self._doc_length[book_id] / avg_length
+                scores[book_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
+
+    async def search(self, db, q, filters, skip=0, limit=20):
+        if not self.built:
+            await self._build(db)
+        scores = self.score(q)
+        ranked = sorted(scores, key=lambda book_id: (-scores[book_id], book_id))
+        if filters.active:
+            ranked = await self._filter(db, ranked, filters, skip + limit)
+        page = ranked[skip : skip + limit]
+        if not page:
+            return []
+        result = await db.execute(select(Book).where(Book.id.in_(page)))
+        books = {book.id: book for book in result.scalars().all()}
+        return [books[book_id] for book_id in page if book_id in books]
+
+    @staticmethod
+    async def _filter(
+        db: AsyncSession, ranked: List[int], filters: BookSearchFilters, wanted: int
+    ) -> List[int]:
+        """The ``ranked`` ids that pass ``filters``, in order, up to ``wanted``.
+
+        Checked a batch at a time in rank order, so a broad query does not
+        send one bind per match and a page near the top stops early.
+        """
+        matching: List[int] = []
+        for start in range(0, len(ranked), FILTER_BATCH_SIZE):
+            batch = ranked[start : start + FILTER_BATCH_SIZE]
+            stmt = filters.apply(select(Book.id).where(Book.id.in_(batch)))
+            passed = set((await db.execute(stmt)).scalars())
+            matching.extend(book_id for book_id in batch if book_id in passed)
+            if len(matching) >= wanted:
+                break
+        return matching
+
+
+def _build_backend() -> SearchBackend:
+    backend = settings.SEARCH_BACKEND
+    if backend == "auto":
+        backend = "mysql" if engine.dialect.name == "mysql" else "memory"
+    if backend == "mysql":
+        return MySQLFullTextBackend()
+    return InvertedIndexBackend()
+
+
+search_backend = _build_backend()
+
+
+async def search_books(
+    db: AsyncSession,
+    q: str,
+    filters: BookSearchFilters,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Book]:
+    return await search_backend.search(db, q, filters, skip=skip, limit=limit)
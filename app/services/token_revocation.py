@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import RevokedToken
+from app.models.base import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Revocations are re-read this far behind the newest one seen, so rows whose
+# transaction committed late (or on a host with a slower clock) are not missed.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenRevocations:
+    """Revoked token ids, persisted in ``revoked_tokens`` and mirrored in a Bloom filter.
+
+    ``is_revoked`` answers the common case, a token that was never revoked,
+    from the filter without a query; only filter hits (revoked tokens and
+    the rare false positive) are confirmed against the table. Each process
+    adds its own revocations at once and picks up other workers' every
+    ``interval`` seconds. Until the first load succeeds every check goes to
+    the database.
+    """
+
+    def __init__(
+        self, interval: float, prune_interval: float, capacity: int, error_rate: float
+    ) -> None:
+        self.interval = interval
+        self.prune_interval = prune_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        self.loaded = False
+        self._synced_through: Optional[datetime] = None
+        self._last_prune = 0.0
+        self._loading: Optional[list[str]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.entries = 0
+        self.checks = 0
+        self.filter_hits = 0
+        self.revoked_hits = 0
+        self.syncs = 0
+        self.errors = 0
+
+    async def is_revoked(self, db: AsyncSession, jti: str) -> bool:
+        self.checks += 1
+        if self.loaded and jti not in self.filter:
+            return False
+        self.filter_hits += 1
+        found = await db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti))
+        if found is not None:
+            self.revoked_hits += 1
+        return found is not None
+
+    async def revoke(
+        self, db: AsyncSession, jti: str, user_id: int, expires_at: datetime
+    ) -> bool:
+        """Record ``jti`` as revoked; ``False`` if it already was.
+
+        The unique index makes this the check as well: of two concurrent
+        calls for the same token, exactly one gets ``True``.
+        """
+        result = await db.execute(
+            insert(RevokedToken)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+        )
+        # Added before commit: if the transaction rolls back, the stray bit
+        # only costs a query on that token's checks.
+        self.filter.add(jti)
+        if self._loading is not None:
+            self._loading.append(jti)  # the filter is about to be replaced
+        if result.rowcount != 1:
+            return False
+        self.entries += 1
+        return True
+
+    async def load(self) -> None:
+        """Rebuild the filter from every unexpired revocation, pruning expired rows."""
+        self._loading = []
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    delete(RevokedToken).where(RevokedToken.expires_at < utcnow())
+                )
+                await db.commit()
+                rows = (
+                    await db.execute(select(RevokedToken.jti, RevokedToken.created_at))
+                ).all()
+            # Keep the false-positive rate near its target as revocations pile up.
+            bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+            for jti, _ in rows:
+                bloom.add(jti)
+            for jti in self._loading:
+                bloom.add(jti)
+        finally:
+            self._loading = None
+        self.filter = bloom
+        self.entries = len(rows)
+        self._synced_through = max((created for _, created in rows), default=None)
+        self._last_prune = time.monotonic()
+        self.loaded = True
+
+    async def sync(self) -> int:
+        """Add revocations recorded since the last sync; return rows read."""
+        if not self.loaded or time.monotonic() - self._last_prune >= self.prune_interval:
+            await self.load()
+            return self.entries
+        stmt = select(RevokedToken.jti, RevokedToken.created_at)
+        if self._synced_through is not None:
+            stmt = stmt.where(
+                RevokedToken.created_at >= self._synced_through - SYNC_OVERLAP
+            )
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(stmt)).all()
+        for jti, created_at in rows:
+            if jti not in self.filter:
+                self.filter.add(jti)
+                self.entries += 1
+            if self._synced_through is None or created_at > self._synced_through:
+                self._synced_through = created_at
+        self.syncs += 1
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Token revocation sync failed")
+
+    async def start(self) -> None:
+        try:
+            await self.load()
+        except Exception:
+            # Checks fall back to the database until a sync succeeds.
+            self.errors += 1
+            logger.warning("Token revocation load failed", exc_info=True)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="token-revocations")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "loaded": self.loaded,
+            "entries": self.entries,
+            "filter_bytes": self.filter.size_bytes,
+            "filter_hashes": self.filter.hashes,
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "revoked_hits": self.revoked_hits,
+            "syncs": self.syncs,
+            "errors": self.errors,
+        }
+
+
+token_revocations = TokenRevocations(
+    interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    prune_interval=settings.TOKEN_REVOCATION_PRUNE_SECONDS,
+    capacity=settings.TOKEN_REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+)
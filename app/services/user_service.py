@@ -1,21 +1,41 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from fastapi import HTTPException, status
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.cache import TTLCache
+from app.core.pagination import Keyset, paginate, resolve_sort
 from app.core.permissions import RoleName
-from app.core.security import hash_password
+from app.core.principal import principal_cache
+from app.core.security import hash_password_async
+from app.core.serialization import dumps, row_columns
+from app.db.session import after_commit
 from app.models import Role, User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserOut, UserUpdate
+
+
+# Detached copies of roles looked up by name; registration needs the member
+# role every time, and it changes only through role_service.update_role.
+_roles_by_name: TTLCache[str, Role] = TTLCache(max_entries=16, ttl=300)
+
+
+def invalidate_role_cache() -> None:
+    _roles_by_name.clear()
 
 
 async def get_default_member_role(db: AsyncSession) -> Role:
-    result = await db.execute(select(Role).where(Role.name == RoleName.MEMBER.value))
-    role = result.scalar_one_or_none()
-    if not role:
-        raise RuntimeError("Default member role not found. Have you run the seeder?")
-    return role
+    role = _roles_by_name.get(RoleName.MEMBER.value)
+    if role is None:
+        result = await db.execute(select(Role).where(Role.name == RoleName.MEMBER.value))
+        role = result.scalar_one_or_none()
+        if not role:
+            raise RuntimeError("Default member role not found. Have you run the seeder?")
+        db.expunge(role)
+        _roles_by_name.set(RoleName.MEMBER.value, role)
+    # Attach a copy without a SELECT; the cached instance stays detached.
+    return await db.merge(role, load=False)
 
 
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
@@ -24,35 +44,89 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         username=user_data.username,
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=hash_password(user_data.password),
-        role_id=role.id,
+        hashed_password=await hash_password_async(user_data.password),
+        role=role,
     )
     db.add(db_user)
     await db.flush()
-    await db.refresh(db_user)
+    return db_user
 
-    result = await db.execute(
-        select(User).options(selectinload(User.role)).where(User.id == db_user.id)
-    )
-    return result.scalar_one()
+
+USER_SORTS = {
+    "id": User.id,
+    "username": User.username,
+    "created_at": User.created_at,
+}
+
+
+def user_keyset(sort: str = "id") -> Keyset:
+    return resolve_sort(sort, USER_SORTS, User.id)
 
 
 async def get_all_users(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
 ) -> List[User]:
+    stmt = select(User).options(selectinload(User.role))
     result = await db.execute(
-        select(User)
-        .options(selectinload(User.role))
-        .order_by(User.id)
-        .offset(skip)
-        .limit(limit)
+        paginate(stmt, keyset or user_keyset(), after, skip, limit)
     )
     return list(result.scalars().all())
 
 
+USER_FIELDS = tuple(UserOut.model_fields)
+
+
+async def get_user_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+    fields: Sequence[str] = USER_FIELDS,
+) -> List[Row]:
+    """``get_all_users`` as Core rows of the ``fields`` columns, for ``users_to_json``.
+
+    The nested ``role`` comes from a join, made only when it is requested.
+    """
+    keyset = keyset or user_keyset()
+    columns = row_columns(
+        User,
+        [name for name in fields if name != "role"],
+        keyset.column,
+        keyset.id_column,
+    )
+    stmt = select(*columns)
+    if "role" in fields:
+        stmt = stmt.add_columns(
+            Role.id.label("role_id"), Role.name.label("role_name")
+        ).join(Role, Role.id == User.role_id)
+    result = await db.execute(paginate(stmt, keyset, after, skip, limit))
+    return list(result.all())
+
+
+def users_to_json(rows: List[Row], fields: Sequence[str] = USER_FIELDS) -> bytes:
+    return dumps(
+        [
+            {
+                name: (
+                    {"id": row.role_id, "name": row.role_name}
+                    if name == "role"
+                    else getattr(row, name)
+                )
+                for name in fields
+            }
+            for row in rows
+        ]
+    )
+
+
 async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     result = await db.execute(
-        select(User).options(selectinload(User.role)).where(User.id == user_id)
+        select(User).options(joinedload(User.role)).where(User.id == user_id)
     )
     return result.scalar_one_or_none()
 
@@ -75,22 +149,23 @@ async def update_user(
 
     password = update_dict.pop("password", None)
     if password is not None:
-        db_user.hashed_password = hash_password(password)
+        db_user.hashed_password = await hash_password_async(password)
 
     role_id = update_dict.pop("role_id", None)
-    if role_id is not None:
-        db_user.role_id = role_id
+    if role_id is not None and role_id != db_user.role_id:
+        role = await db.get(Role, role_id)
+        if role is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Role not found"
+            )
+        db_user.role = role
 
     for key, value in update_dict.items():
         setattr(db_user, key, value)
 
     await db.flush()
-    await db.refresh(db_user)
-
-    result = await db.execute(
-        select(User).options(selectinload(User.role)).where(User.id == db_user.id)
-    )
-    return result.scalar_one_or_none()
+    after_commit(db, lambda: principal_cache.invalidate_user(user_id))
+    return db_user
 
 
 async def delete_user(db: AsyncSession, user_id: int) -> bool:
@@ -98,4 +173,5 @@ async def delete_user(db: AsyncSession, user_id: int) -> bool:
     if not db_user:
         return False
     await db.delete(db_user)
+    after_commit(db, lambda: principal_cache.invalidate_user(user_id))
     return True
@@ -0,0 +1,92 @@
+"""Hundreds of simultaneous checkouts of one title: throughput and oversell check.
+
+Runs ``borrow_service.borrow_book`` directly against the configured database
+(seed it first with ``python -m app.db.seed``)::
+
+    python -m benchmarks.checkout_contention --borrowers 500 --copies 100
+
+Each borrower uses its own session and transaction, like a request would.
+The number of successful checkouts must never exceed ``--copies`` and must
+match the copies taken from the book; anything else is an oversell.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.principal import Principal
+from app.db.session import AsyncSessionLocal
+from app.models import Book, User
+from app.schemas.book import BookCreate
+from app.schemas.borrow import BorrowCreate
+from app.services import book_service, borrow_service
+
+
+async def checkout(principal: Principal, book_id: int) -> str:
+    async with AsyncSessionLocal() as db:
+        try:
+            await borrow_service.borrow_book(db, principal, BorrowCreate(book_id=book_id))
+            await db.commit()
+            return "ok"
+        except HTTPException as exc:
+            await db.rollback()
+            return str(exc.status_code)
+        except Exception as exc:  # lock timeouts, deadlocks, ...
+            await db.rollback()
+            return type(exc).__name__
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(
+            select(User)
+            .options(selectinload(User.role))
+            .where(User.username == args.username)
+        )
+        principal = Principal.from_user(user)
+        book = await book_service.create_book(
+            db,
+            BookCreate(
+                isbn=uuid.uuid4().hex[:20],
+                title="Contention benchmark",
+                author="bench",
+                total_copies=args.copies,
+                available_copies=args.copies,
+            ),
+        )
+        await db.commit()
+        book_id = book.id
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(checkout(principal, book_id) for _ in range(args.borrowers))
+    )
+    elapsed = time.perf_counter() - start
+
+    async with AsyncSessionLocal() as db:
+        remaining = await db.scalar(select(Book.available_copies).where(Book.id == book_id))
+
+    counts: dict[str, int] = {}
+    for outcome in outcomes:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    succeeded = counts.get("ok", 0)
+    print(f"borrowers={args.borrowers} copies={args.copies} elapsed={elapsed:.3f}s")
+    print(f"throughput: {args.borrowers / elapsed:.0f} checkouts/s")
+    print(f"outcomes: {counts}")
+    print(f"available_copies after: {remaining}")
+    if succeeded > args.copies or remaining != args.copies - succeeded:
+        raise SystemExit(f"FAIL: {succeeded} checkouts succeeded for {args.copies} copies")
+    print("OK: zero oversell")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--borrowers", type=int, default=500)
+    parser.add_argument("--copies", type=int, default=100)
+    parser.add_argument("--username", default="admin")
+    asyncio.run(main(parser.parse_args()))
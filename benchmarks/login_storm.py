@@ -0,0 +1,90 @@
+"""Measure ``GET /books`` latency while a storm of logins hits the same server.
+
+Start the API (e.g. ``uvicorn app.main:app --workers 1``) and run::
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000
+
+The script first measures ``/books`` alone, then again with ``--logins``
+concurrent login loops running. With bcrypt on the worker pool the p99 of
+the second phase should stay close to the first; logins beyond the pool's
+queue are rejected with 503 and counted separately.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.stats import percentiles
+
+API = "/api/v1"
+
+
+async def fetch_books(client: httpx.AsyncClient, headers: dict, seconds: float) -> list[float]:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(f"{API}/books/", headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def login_loop(client: httpx.AsyncClient, args, stop: asyncio.Event, counts: dict) -> None:
+    while not stop.is_set():
+        response = await client.post(
+            f"{API}/auth/login",
+            json={"username": args.username, "password": args.password},
+        )
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+def report(name: str, latencies: list[float]) -> None:
+    p50, p95, p99 = percentiles(latencies, 0.50, 0.95, 0.99)
+    print(
+        f"{name:>12}: n={len(latencies):6d}  "
+        f"p50={p50:7.2f}ms  p95={p95:7.2f}ms  p99={p99:7.2f}ms"
+    )
+
+
+async def main(args) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        response = await client.post(
+            f"{API}/auth/login",
+            json={"username": args.username, "password": args.password},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        baseline = await fetch_books(client, headers, args.seconds)
+        report("baseline", baseline)
+
+        stop = asyncio.Event()
+        counts: dict[int, int] = {}
+        # Separate client so the storm cannot starve /books of connections.
+        async with httpx.AsyncClient(
+            base_url=args.base_url,
+            timeout=30,
+            limits=httpx.Limits(max_connections=args.logins),
+        ) as storm_client:
+            storm = [
+                asyncio.create_task(login_loop(storm_client, args, stop, counts))
+                for _ in range(args.logins)
+            ]
+            during = await fetch_books(client, headers, args.seconds)
+            stop.set()
+            await asyncio.gather(*storm)
+        report("login storm", during)
+        print(f"login responses by status: {dict(sorted(counts.items()))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="Admin@1234")
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
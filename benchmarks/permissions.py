@@ -0,0 +1,49 @@
+"""Per-request cost of the RBAC check: JSON parsing vs. precompiled bitmasks.
+
+Run with ``python -m benchmarks.permissions``.
+"""
+
+import json
+import timeit
+
+from app.core.permissions import (
+    ROLE_PERMISSIONS,
+    Permission,
+    RoleName,
+    RolePermissionTable,
+    permission_mask,
+    permissions_to_strings,
+)
+
+ROLE_JSON = json.dumps(permissions_to_strings(ROLE_PERMISSIONS[RoleName.LIBRARIAN]))
+REQUIRED = [Permission.BORROW_READ, Permission.MEMBER_UPDATE]
+
+
+def legacy_check() -> bool:
+    try:
+        assigned = set(json.loads(ROLE_JSON or "[]"))
+    except json.JSONDecodeError:
+        assigned = set()
+    return not [p.value for p in REQUIRED if p.value not in assigned]
+
+
+table = RolePermissionTable()
+required_mask = permission_mask(p.value for p in REQUIRED)
+
+
+def bitmask_check() -> bool:
+    return table.mask_for(2, ROLE_JSON) & required_mask == required_mask
+
+
+def main(number: int = 200_000) -> None:
+    assert legacy_check() and bitmask_check()
+    results = {}
+    for name, fn in (("json+set", legacy_check), ("bitmask", bitmask_check)):
+        seconds = min(timeit.repeat(fn, number=number, repeat=5))
+        results[name] = seconds / number * 1e9
+        print(f"{name:>10}: {results[name]:8.1f} ns/check")
+    print(f"   speedup: {results['json+set'] / results['bitmask']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cost of a token revocation check: Bloom filter vs. a database lookup.
+
+Runs against the configured database (create the schema first, e.g. with
+``python -m app.db.seed``)::
+
+    python -m benchmarks.revocation --revoked 100000
+
+Fills ``revoked_tokens`` with synthetic revocations, loads them the way the
+app does at startup, then times ``is_revoked`` for tokens that were never
+revoked (the common case, answered by the filter) against the primary-key
+lookup every check would otherwise need. Also reports the observed
+false-positive rate. The synthetic rows are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models import RevokedToken
+from app.models.base import utcnow
+from app.services.token_revocation import TokenRevocations
+
+USER_ID = -1  # marks the synthetic rows
+
+
+async def fill(count: int) -> None:
+    expires_at = utcnow() + timedelta(hours=1)
+    async with AsyncSessionLocal() as db:
+        for start in range(0, count, 10_000):
+            await db.execute(
+                insert(RevokedToken),
+                [
+                    {"jti": uuid.uuid4().hex, "user_id": USER_ID, "expires_at": expires_at}
+                    for _ in range(min(10_000, count - start))
+                ],
+            )
+        await db.commit()
+
+
+async def main(args) -> None:
+    await fill(args.revoked)
+    try:
+        revocations = TokenRevocations(
+            interval=60,
+            prune_interval=3600,
+            capacity=args.revoked,
+            error_rate=args.error_rate,
+        )
+        started = time.perf_counter()
+        await revocations.load()
+        print(
+            f"loaded {revocations.entries} revocations in"
+            f" {(time.perf_counter() - started) * 1e3:.0f} ms;"
+            f" filter {revocations.filter.size_bytes / 1024:.0f} KiB,"
+            f" {revocations.filter.hashes} hashes"
+        )
+
+        fresh = [uuid.uuid4().hex for _ in range(args.checks)]
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            for jti in fresh:
+                assert not await revocations.is_revoked(db, jti)
+            filtered = (time.perf_counter() - started) / args.checks
+
+            lookups = []
+            for jti in fresh[: args.lookups]:
+                started = time.perf_counter()
+                await db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti))
+                lookups.append(time.perf_counter() - started)
+        lookup = statistics.median(lookups)
+
+        print(f"{'filter check':>16}: {filtered * 1e6:9.2f} us")
+        print(f"{'database lookup':>16}: {lookup * 1e6:9.2f} us")
+        print(f"{'speedup':>16}: {lookup / filtered:9.0f}x")
+        print(
+            f"{'false positives':>16}: {revocations.filter_hits / args.checks:9.4%}"
+            f" (target {args.error_rate:.2%})"
+        )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RevokedToken).where(RevokedToken.user_id == USER_ID))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--revoked", type=int, default=100_000)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--checks", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""List serialization: ORM + ``response_model`` vs. Core rows + orjson.
+
+Runs both paths of ``GET /books`` against the configured database (seed it
+first with ``python -m app.db.seed``)::
+
+    python -m benchmarks.serialization --sizes 100 1000 10000
+
+The ORM path is what FastAPI does for ``response_model=List[BookOut]``:
+hydrate ``Book`` objects, validate each through ``BookOut`` with
+``from_attributes``, dump to JSON-compatible Python and ``json.dumps`` it.
+The fast path selects only ``BookOut``'s columns and encodes the rows with
+``rows_to_json``. Both must produce identical bytes. Missing rows are filled
+with synthetic books, which are deleted again afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, select
+
+from app.core.serialization import rows_to_json
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Book
+from app.schemas.book import BookOut
+from app.services import book_service
+
+ISBN_PREFIX = "bench-ser-"
+
+_adapter = TypeAdapter(List[BookOut])
+
+
+async def orm_path(db, limit: int) -> bytes:
+    books = await book_service.list_books(db, limit=limit)
+    content = _adapter.dump_python(
+        _adapter.validate_python(books, from_attributes=True), mode="json"
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+async def fast_path(db, limit: int) -> bytes:
+    rows = await book_service.list_book_rows(db, limit=limit)
+    return rows_to_json(rows, book_service.BOOK_FIELDS)
+
+
+async def ensure_rows(db, wanted: int) -> int:
+    have = await db.scalar(select(func.count(Book.id)))
+    missing = max(0, wanted - have)
+    if missing:
+        await db.execute(
+            insert(Book),
+            [
+                {
+                    "isbn": f"{ISBN_PREFIX}{i}",
+                    "title": f"Serialization benchmark volume {i}",
+                    "author": "bench",
+                    "publisher": "Bench Press",
+                    "genre": "benchmark",
+                    "description": "Synthetic row for benchmarks.serialization",
+                    "total_copies": 3,
+                    "available_copies": 3,
+                    "published_year": 2000 + i % 25,
+                }
+                for i in range(missing)
+            ],
+        )
+        await db.commit()
+    return missing
+
+
+async def measure(path, limit: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        # A fresh session per run, as each request would have.
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await path(db, limit)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        added = await ensure_rows(db, max(args.sizes))
+    try:
+        print(f"{'rows':>7} {'orm ms':>9} {'fast ms':>9} {'speedup':>8}")
+        for size in args.sizes:
+            async with AsyncSessionLocal() as db:
+                if await orm_path(db, size) != await fast_path(db, size):
+                    raise SystemExit(f"outputs differ at {size} rows")
+            orm = await measure(orm_path, size, args.repeat)
+            fast = await measure(fast_path, size, args.repeat)
+            print(f"{size:>7} {orm * 1e3:>9.2f} {fast * 1e3:>9.2f} {orm / fast:>7.1f}x")
+    finally:
+        if added:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(Book).where(Book.isbn.startswith(ISBN_PREFIX)))
+                await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=15)
+    asyncio.run(main(parser.parse_args()))
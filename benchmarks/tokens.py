@@ -0,0 +1,62 @@
+"""Bearer token cost: python-jose vs. ``HMACCodec`` vs. the verified-claims cache.
+
+Run with ``python -m benchmarks.tokens``.
+
+Encodes and decodes an access token shaped like the ones ``/auth/login``
+issues, with the configured ``SECRET_KEY`` and HMAC ``ALGORITHM``. Tokens
+from each implementation are first checked to verify under the other.
+"""
+
+import argparse
+import time
+import timeit
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.tokens import HMACCodec, TokenVerifier
+
+
+def main(number: int) -> None:
+    now = int(time.time())
+    claims = {"sub": "42", "exp": now + 1800, "iat": now, "type": "access"}
+    codec = HMACCodec(settings.SECRET_KEY, settings.ALGORITHM)
+    verifier = TokenVerifier(max_entries=1000, ttl=300)
+
+    jose_token = jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    lean_token = codec.encode(claims)
+    assert codec.decode(jose_token, time.time()) == claims
+    assert jwt.decode(lean_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]) == claims
+    verifier.decode(lean_token)  # prime the cache
+
+    cases = {
+        "encode": {
+            "jose": lambda: jwt.encode(
+                claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+            ),
+            "hmac": lambda: codec.encode(claims),
+        },
+        "decode": {
+            "jose": lambda: jwt.decode(
+                jose_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            ),
+            "hmac": lambda: codec.decode(lean_token, time.time()),
+            "cached": lambda: verifier.decode(lean_token),
+        },
+    }
+    print(f"{settings.ALGORITHM}, {number} calls per run, best of 5")
+    for operation, variants in cases.items():
+        baseline = None
+        for name, fn in variants.items():
+            seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+            baseline = baseline or seconds
+            print(
+                f"{operation:>7} {name:>7}: {seconds * 1e6:7.2f} us/op"
+                f" {1 / seconds:>10,.0f} ops/s {baseline / seconds:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000)
+    main(parser.parse_args().number)
@@ -0,0 +1,39 @@
+"""Write the app's OpenAPI document for ``OPENAPI_SCHEMA_PATH``.
+
+Run at image build time (see the Dockerfile), so workers serve /docs and
+/openapi.json from disk instead of generating the schema on first use::
+
+    python -m scripts.build_openapi openapi.json
+    python -m scripts.build_openapi openapi.json --check   # exit 1 if stale
+
+Building imports the app but never touches the database.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.openapi import build_openapi
+from app.main import app
+
+
+def main(args) -> int:
+    app.openapi_schema = None  # generate, even if OPENAPI_SCHEMA_PATH is set
+    document = build_openapi(app)
+    path = Path(args.path)
+    if args.check:
+        if not path.exists() or path.read_bytes() != document:
+            print(f"{path} is stale; run python -m scripts.build_openapi {path}")
+            return 1
+        print(f"{path} is up to date")
+        return 0
+    path.write_bytes(document)
+    print(f"wrote {path} ({len(document) / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--check", action="store_true")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+import pytest
+from pytest_asyncio import is_async_test
+
+# Settings are read when ``app`` is first imported, so the database is chosen
+# here. Set DB_URL to run the suite against MySQL instead of a scratch SQLite file.
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault(
+    "DB_URL",
+    f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='library-tests-')}/test.db",
+)
+
+
+def pytest_collection_modifyitems(items):
+    # One event loop for the whole run: pooled connections and the app's
+    # background tasks belong to the loop that created them.
+    marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(marker, append=False)
+
+
+@pytest.fixture(scope="session")
+async def database():
+    """The engine, with the schema migrated to head and the seed data loaded."""
+    from app.db.seed import seed
+    from app.db.session import engine
+
+    await seed()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def client(database):
+    """An in-process client for the app, signed in as the seeded admin."""
+    import httpx
+
+    from app.main import app
+    from app.services.token_revocation import token_revocations
+
+    # As the lifespan does, but without its background tasks: their
+    # periodic queries would land in whichever test happens to be running.
+    await token_revocations.load()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/auth/login", json={"username": "admin", "password": "Admin@1234"}
+        )
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        yield client
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.services import api_key_service
+from app.services.api_key_usage import api_key_usage
+
+API = "/api/v1"
+UNKNOWN = settings.API_KEY_PREFIX + "f" * 64
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _new_key(client, **body) -> dict:
+    response = await client.post(f"{API}/users/me/api-keys", json={"name": "t", **body})
+    response.raise_for_status()
+    return response.json()
+
+
+async def _as_key(client, key: str):
+    # The client logs in as admin; send only the key.
+    return await client.get(
+        f"{API}/users/me", headers={"Authorization": "", "X-API-Key": key}
+    )
+
+
+@pytest.fixture
+def statements(database):
+    executed = []
+    listener = lambda *args: executed.append(args[2])  # noqa: E731
+    event.listen(database.sync_engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(database.sync_engine, "before_cursor_execute", listener)
+
+
+async def test_key_authenticates_and_is_cached(client, statements):
+    key = (await _new_key(client))["key"]
+    first = await _as_key(client, key)
+    assert first.status_code == 200
+    assert first.json()["username"] == "admin"
+
+    hits = api_key_service._keys.stats.hits
+    statements.clear()
+    assert (await _as_key(client, key)).status_code == 200
+    assert api_key_service._keys.stats.hits == hits + 1
+    assert statements == []
+
+
+async def test_unknown_key_is_negatively_cached(client, statements):
+    statements.clear()
+    first = await _as_key(client, UNKNOWN)
+    assert first.status_code == 401
+    assert first.json()["detail"] == "Invalid or inactive API key"
+    assert len(statements) == 1
+
+    statements.clear()
+    hits = api_key_service._unknown_keys.stats.hits
+    assert (await _as_key(client, UNKNOWN)).status_code == 401
+    assert api_key_service._unknown_keys.stats.hits == hits + 1
+    assert statements == []
+
+
+@pytest.mark.parametrize(
+    "key, detail",
+    [
+        ("nope_" + "0" * 64, "Invalid API key prefix"),
+        (settings.API_KEY_PREFIX + "not-hex", "Invalid or inactive API key"),
+    ],
+    ids=["prefix", "malformed"],
+)
+async def test_bad_keys_never_reach_the_database(client, statements, key, detail):
+    statements.clear()
+    response = await _as_key(client, key)
+    assert response.status_code == 401
+    assert response.json()["detail"] == detail
+    assert statements == []
+
+
+async def test_expired_key_is_rejected(client):
+    past = _utcnow() - timedelta(minutes=1)
+    expired = await _new_key(client, expires_at=past.isoformat())
+    response = await _as_key(client, expired["key"])
+    assert response.status_code == 401
+    assert response.json()["detail"] == "API key expired"
+
+
+async def test_cached_key_expires_on_time(client, monkeypatch):
+    expires_at = _utcnow() + timedelta(hours=1)
+    key = (await _new_key(client, expires_at=expires_at.isoformat()))["key"]
+    assert (await _as_key(client, key)).status_code == 200
+
+    later = expires_at + timedelta(seconds=1)
+    monkeypatch.setattr(api_key_service, "utcnow", lambda: later)
+    response = await _as_key(client, key)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "API key expired"
+
+
+async def test_usage_is_stamped_on_flush(client):
+    created = await _new_key(client)
+    assert created["last_used_at"] is None
+    await _as_key(client, created["key"])
+    await api_key_usage.flush()
+
+    keys = (await client.get(f"{API}/users/me/api-keys")).json()
+    stamped = next(key for key in keys if key["id"] == created["id"])
+    assert stamped["last_used_at"] is not None
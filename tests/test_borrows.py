@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+
+API = "/api/v1"
+
+
+async def _new_book(client, copies: int) -> dict:
+    body = {
+        "isbn": uuid.uuid4().hex[:13],
+        "title": "T",
+        "author": "A",
+        "total_copies": copies,
+        "available_copies": copies,
+    }
+    response = await client.post(f"{API}/books/", json=body)
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_batch_checkout_reports_the_inserted_borrows(client):
+    one, two = await _new_book(client, 1), await _new_book(client, 2)
+    book_ids = [two["id"], one["id"], two["id"], one["id"], 0]
+    response = await client.post(f"{API}/borrows/batch", json={"book_ids": book_ids})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["status_code"] for item in items] == [201, 201, 201, 409, 404]
+
+    borrows = [item["borrow"] for item in items[:3]]
+    assert [borrow["book_id"] for borrow in borrows] == book_ids[:3]
+    assert len({borrow["id"] for borrow in borrows}) == 3
+
+    # The ids are the real rows: returning them puts every copy back.
+    response = await client.post(
+        f"{API}/borrows/returns/batch",
+        json={"borrow_ids": [borrow["id"] for borrow in borrows]},
+    )
+    returned = [item["borrow"] for item in response.json()["items"]]
+    assert [(b["id"], b["book_id"]) for b in returned] == [
+        (b["id"], b["book_id"]) for b in borrows
+    ]
+    for book in (one, two):
+        current = (await client.get(f"{API}/books/{book['id']}")).json()
+        assert current["available_copies"] == book["total_copies"]
+
+
+async def test_concurrent_checkouts_never_oversell(client):
+    book = await _new_book(client, 2)
+    checkout = {"book_id": book["id"]}
+    responses = await asyncio.gather(
+        *(client.post(f"{API}/borrows/", json=checkout) for _ in range(6))
+    )
+    codes = sorted(response.status_code for response in responses)
+    assert codes == [201] * 2 + [409] * 4
+    current = (await client.get(f"{API}/books/{book['id']}")).json()
+    assert current["available_copies"] == 0
+
+
+async def test_checkout_of_unknown_book_is_a_404(client):
+    response = await client.post(f"{API}/borrows/", json={"book_id": 10**9})
+    assert response.status_code == 404
+
+
+async def test_return_gives_the_copy_back_once(client):
+    book = await _new_book(client, 1)
+    borrow = (await client.post(f"{API}/borrows/", json={"book_id": book["id"]})).json()
+    url = f"{API}/borrows/{borrow['id']}/return"
+    responses = await asyncio.gather(client.post(url), client.post(url))
+    assert [response.status_code for response in responses] == [200, 200]
+    current = (await client.get(f"{API}/books/{book['id']}")).json()
+    assert current["available_copies"] == 1
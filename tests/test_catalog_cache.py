@@ -0,0 +1,124 @@
+"""Catalog cache on the Redis backend, with an in-memory stand-in for the client."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from app.core.cache import build_cache_backend
+from app.db.session import get_db
+from app.schemas.book import BookCreate
+from app.services import book_service
+from app.services.catalog_cache import VERSION_KEY, CachedPage, catalog_cache
+
+API = "/api/v1"
+
+
+class FakeRedis:
+    """The subset of ``redis.asyncio.Redis`` that ``RedisCacheBackend`` uses."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeRedis()
+    pages = build_cache_backend(
+        "catalog",
+        max_entries=0,
+        ttl=60,
+        dumps=CachedPage.dumps,
+        loads=CachedPage.loads,
+        client=client,
+    )
+    versions = build_cache_backend("catalog_version", 1, 3600, client=client)
+    monkeypatch.setattr(catalog_cache, "pages", pages)
+    monkeypatch.setattr(catalog_cache, "versions", versions)
+    monkeypatch.setattr(catalog_cache, "enabled", True)
+    return client
+
+
+def _version(redis: FakeRedis) -> bytes | None:
+    return redis.data.get(f"catalog_version:{VERSION_KEY}")
+
+
+def _book_body() -> dict:
+    return {"isbn": uuid.uuid4().hex[:13], "title": "Cached", "author": "R"}
+
+
+async def _new_book(client) -> dict:
+    response = await client.post(f"{API}/books/", json=_book_body())
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_pages_are_served_from_redis(client, redis):
+    book = await _new_book(client)
+    for path in ("/books/", f"/books/{book['id']}"):
+        first = await client.get(f"{API}{path}")
+        hits = catalog_cache.stats.hits
+        second = await client.get(f"{API}{path}")
+        assert catalog_cache.stats.hits == hits + 1
+        assert second.content == first.content
+    assert f"catalog:book:{book['id']}" in redis.data
+
+
+async def _create(client, book):
+    await client.post(f"{API}/books/", json=_book_body())
+
+
+async def _update(client, book):
+    await client.patch(f"{API}/books/{book['id']}", json={"title": "Renamed"})
+
+
+async def _delete(client, book):
+    await client.delete(f"{API}/books/{book['id']}")
+
+
+@pytest.mark.parametrize("write", [_create, _update, _delete])
+async def test_writes_bump_the_version(client, redis, write):
+    book = await _new_book(client)
+    await client.get(f"{API}/books/")
+    await client.get(f"{API}/books/{book['id']}")
+    version = _version(redis)
+    assert version is not None
+
+    await write(client, book)
+    assert _version(redis) != version
+    if write is not _create:
+        assert f"catalog:book:{book['id']}" not in redis.data
+    # Pages stored under the old version are never looked up again.
+    listing = await client.get(f"{API}/books/", params={"limit": 1000})
+    titles = {row["id"]: row["title"] for row in listing.json()}
+    expected = {_create: "Cached", _update: "Renamed", _delete: None}[write]
+    assert titles.get(book["id"]) == expected
+
+
+async def test_rolled_back_write_does_not_invalidate(database, redis):
+    await catalog_cache.version()
+    version, before = _version(redis), dict(redis.data)
+
+    session = get_db(SimpleNamespace(method="POST"), Response())
+    db = await anext(session)
+    await book_service.create_book(db, BookCreate(**_book_body()))
+    with pytest.raises(RuntimeError):
+        await session.athrow(RuntimeError("request failed"))
+
+    assert _version(redis) == version
+    assert redis.data == before
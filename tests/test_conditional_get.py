@@ -0,0 +1,68 @@
+import uuid
+
+import pytest
+
+from app.services.catalog_cache import catalog_cache
+
+API = "/api/v1"
+
+
+@pytest.fixture(params=[True, False], ids=["cached", "uncached"])
+def catalog_caching(request, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "enabled", request.param)
+
+
+async def _new_book(client) -> dict:
+    body = {"isbn": uuid.uuid4().hex[:13], "title": "Conditional", "author": "E"}
+    response = await client.post(f"{API}/books/", json=body)
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_list_revalidates_until_the_catalog_changes(client, catalog_caching):
+    first = await client.get(f"{API}/books/")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = await client.get(f"{API}/books/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+    # Weak comparison, and any tag in a list.
+    tags = {"If-None-Match": f'"x", {etag[2:]}'}
+    listed = await client.get(f"{API}/books/", headers=tags)
+    assert listed.status_code == 304
+
+    other_page = await client.get(f"{API}/books/", params={"limit": 5})
+    assert other_page.headers["ETag"] != etag
+
+    await _new_book(client)
+    changed = await client.get(f"{API}/books/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+async def test_detail_revalidates_by_etag_and_date(client, catalog_caching):
+    book = await _new_book(client)
+    url = f"{API}/books/{book['id']}"
+    first = await client.get(url)
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+    since = {"If-Modified-Since": last_modified}
+    assert (await client.get(url, headers=since)).status_code == 304
+    # If-None-Match wins over If-Modified-Since.
+    both = {"If-None-Match": '"other"', **since}
+    assert (await client.get(url, headers=both)).status_code == 200
+
+    await client.patch(url, json={"title": "Edited"})
+    changed = await client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["title"] == "Edited"
+    assert changed.headers["ETag"] != etag
+
+
+async def test_unknown_book_is_a_404_not_a_304(client, catalog_caching):
+    response = await client.get(f"{API}/books/{10**9}", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
@@ -0,0 +1,89 @@
+import csv
+import io
+import uuid
+from datetime import datetime
+
+import orjson
+
+from app.core.config import settings
+from app.services import export_service
+
+API = "/api/v1"
+
+
+async def _new_book(client, genre: str, copies: int = 1) -> dict:
+    body = {
+        "isbn": uuid.uuid4().hex[:13],
+        "title": 'Say "hi", ok',
+        "author": "E",
+        "genre": genre,
+        "total_copies": copies,
+        "available_copies": copies,
+    }
+    response = await client.post(f"{API}/books/", json=body)
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_ndjson_export(client):
+    genre = uuid.uuid4().hex
+    books = [await _new_book(client, genre) for _ in range(3)]
+    response = await client.get(f"{API}/books/export", params={"genre": genre})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="books.ndjson"' in response.headers["content-disposition"]
+
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [book["id"] for book in books]
+    assert rows[0]["title"] == 'Say "hi", ok'
+    assert isinstance(datetime.fromisoformat(rows[0]["created_at"]), datetime)
+
+
+async def test_csv_export(client):
+    genre = uuid.uuid4().hex
+    books = [await _new_book(client, genre) for _ in range(2)]
+    response = await client.get(
+        f"{API}/books/export", params={"genre": genre, "format": "csv"}
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header[:3] == ["id", "isbn", "title"]
+    assert [(int(row[0]), row[2]) for row in rows] == [
+        (book["id"], book["title"]) for book in books
+    ]
+
+
+async def test_export_streams_one_chunk_per_batch(client, monkeypatch):
+    genre = uuid.uuid4().hex
+    for _ in range(5):
+        await _new_book(client, genre)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    stmt = export_service.books_query(genre=genre)
+
+    chunks = [chunk async for chunk in export_service.stream_export(stmt, "ndjson")]
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+    chunks = [chunk async for chunk in export_service.stream_export(stmt, "csv")]
+    assert [chunk.count(b"\n") for chunk in chunks] == [3, 2, 1]  # header first
+
+
+async def test_member_exports_only_their_borrows(client):
+    name = uuid.uuid4().hex[:12]
+    body = {
+        "username": name,
+        "email": f"{name}@example.com",
+        "full_name": "M",
+        "password": "pw",
+    }
+    member = (await client.post(f"{API}/users/", json=body)).json()
+    login = await client.post(
+        f"{API}/auth/login", json={"username": name, "password": "pw"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    book = await _new_book(client, "loans", copies=2)
+    await client.post(f"{API}/borrows/", json={"book_id": book["id"]})  # the admin's
+    await client.post(f"{API}/borrows/", json={"book_id": book["id"]}, headers=headers)
+
+    response = await client.get(f"{API}/borrows/export", headers=headers)
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert {row["user_id"] for row in rows} == {member["id"]}
@@ -0,0 +1,129 @@
+import uuid
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services import import_service
+
+API = "/api/v1"
+
+
+async def _stream(data: str, size: int = 7):
+    # Small chunks, so records and multi-byte characters straddle them.
+    raw = data.encode("utf-8")
+    for start in range(0, len(raw), size):
+        yield raw[start : start + size]
+
+
+async def _parse(data: str) -> list:
+    return [item async for item in import_service._iter_csv(_stream(data))]
+
+
+def _isbn() -> str:
+    return uuid.uuid4().hex[:13]
+
+
+async def test_quote_inside_an_unquoted_field_is_literal():
+    rows = await _parse(
+        'isbn,title,author\nq1,5" Floppy Guide,Bob\nq2,Normal,Ann\nq3,Another,Cid\n'
+    )
+    assert rows == [
+        (1, {"isbn": "q1", "title": '5" Floppy Guide', "author": "Bob"}),
+        (2, {"isbn": "q2", "title": "Normal", "author": "Ann"}),
+        (3, {"isbn": "q3", "title": "Another", "author": "Cid"}),
+    ]
+
+
+async def test_quoted_field_spans_lines():
+    rows = await _parse(
+        "isbn,title,author,description\r\n"
+        'm1,Multi,Ann,"first line\r\nsecond, with ""quotes"""\r\n'
+        "m2,Next,Bob,plain\r\n"
+    )
+    assert rows == [
+        (
+            1,
+            {
+                "isbn": "m1",
+                "title": "Multi",
+                "author": "Ann",
+                "description": 'first line\r\nsecond, with "quotes"',
+            },
+        ),
+        (2, {"isbn": "m2", "title": "Next", "author": "Bob", "description": "plain"}),
+    ]
+
+
+async def test_unterminated_quote_rejects_one_row_and_recovers():
+    rows = await _parse(
+        'isbn,title,author\nu1,"Open,Ann\nu2,Fine,Bob\nu3,"Also open,Cid'
+    )
+    assert [row for row, _ in rows] == [1, 2, 3]
+    assert isinstance(rows[0][1], ValueError)
+    assert rows[1][1] == {"isbn": "u2", "title": "Fine", "author": "Bob"}
+    assert isinstance(rows[2][1], ValueError)
+
+
+async def test_oversized_open_record_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 64)
+    body = 'isbn,title,author\nb1,"' + "x\n" * 100 + '",Ann\n'
+    rows = await _parse(body)
+    assert isinstance(rows[0][1], ValueError)
+    assert rows[0][0] == 1
+
+
+async def test_import_reports_every_row(client):
+    a, b = _isbn(), _isbn()
+    body = f'isbn,title,author\n{a},5" Floppy Guide,Bob\n{b},Old,Ann\n{b},New,Ann\n'
+    response = await client.post(
+        f"{API}/books/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["inserted"], result["updated"], result["superseded"]) == (2, 0, 1)
+    assert result["rejected"] == 0 and result["error"] is None
+
+    listing = await client.get(
+        f"{API}/books/", params={"limit": 1000, "fields": "isbn,title"}
+    )
+    titles = {book["isbn"]: book["title"] for book in listing.json()}
+    assert titles[a] == '5" Floppy Guide'
+    assert titles[b] == "New"
+
+
+async def test_database_error_returns_the_partial_result(client, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    upsert = import_service._upsert_statement
+    calls = 0
+
+    def failing_second_chunk(db, rows, columns):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+        return upsert(db, rows, columns)
+
+    monkeypatch.setattr(import_service, "_upsert_statement", failing_second_chunk)
+    isbns = [_isbn() for _ in range(5)]
+    body = "isbn,title,author\n" + "".join(f"{isbn},T,A\n" for isbn in isbns)
+    response = await client.post(
+        f"{API}/books/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 2
+    assert result["failed"] == 2
+    assert "rows 3-4" in result["error"]
+
+    found = await client.get(f"{API}/books/", params={"limit": 1000, "fields": "isbn"})
+    imported = {book["isbn"] for book in found.json()} & set(isbns)
+    assert imported == set(isbns[:2])
+
+
+@pytest.mark.parametrize("body", ["isbn,title,author\n", ""])
+async def test_empty_import(client, body):
+    response = await client.post(
+        f"{API}/books/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.json()["inserted"] == 0
@@ -0,0 +1,67 @@
+"""The list endpoints' direct row serialization matches the response models."""
+
+import uuid
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.core.principal import Principal
+from app.core.serialization import rows_to_json
+from app.db.session import AsyncSessionLocal
+from app.schemas.book import BookOut
+from app.schemas.borrow import BorrowOut
+from app.schemas.user import UserOut
+from app.services import book_service, borrow_service, user_service
+
+API = "/api/v1"
+STAFF = Principal(
+    id=1,
+    username="admin",
+    email="admin@example.com",
+    full_name="Admin",
+    is_active=True,
+    role_id=1,
+    role=None,
+)
+
+
+async def _books(db):
+    return await book_service.list_books(db, limit=1000)
+
+
+async def _users(db):
+    return await user_service.get_all_users(db, limit=1000)
+
+
+async def _borrows(db):
+    return await borrow_service.list_borrows(db, STAFF, limit=1000)
+
+
+@pytest.mark.parametrize(
+    "path, load, schema",
+    [
+        ("/books/", _books, BookOut),
+        ("/users/", _users, UserOut),
+        ("/borrows/", _borrows, BorrowOut),
+    ],
+    ids=["books", "users", "borrows"],
+)
+async def test_rows_serialize_like_the_response_model(client, path, load, schema):
+    # A borrow (with a null returned_at and notes) so no listing is empty.
+    body = {"isbn": uuid.uuid4().hex[:13], "title": "S", "author": "A"}
+    book = (await client.post(f"{API}/books/", json=body)).json()
+    await client.post(f"{API}/borrows/", json={"book_id": book["id"]})
+
+    response = await client.get(f"{API}{path}", params={"limit": 1000})
+    async with AsyncSessionLocal() as db:
+        objects = await load(db)
+    expected = [schema.model_validate(obj).model_dump(mode="json") for obj in objects]
+    assert expected
+    assert response.json() == expected
+
+
+def test_datetimes_match_pydantic():
+    stamp = datetime(2026, 1, 2, 3, 4, 5, 600)
+    dumped = orjson.loads(rows_to_json([(1, stamp, None)], ["id", "at", "none"]))
+    assert dumped == [{"id": 1, "at": stamp.isoformat(), "none": None}]
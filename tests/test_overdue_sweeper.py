@@ -0,0 +1,59 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Borrow
+from app.services.overdue_sweeper import LeaderLock, OverdueSweeper
+
+API = "/api/v1"
+
+
+async def _borrow(client) -> int:
+    body = {"isbn": uuid.uuid4().hex[:13], "title": "Late", "author": "O"}
+    book = (await client.post(f"{API}/books/", json=body)).json()
+    borrow = await client.post(f"{API}/borrows/", json={"book_id": book["id"]})
+    return borrow.json()["id"]
+
+
+async def _statuses(ids: list[int]) -> dict[int, str]:
+    async with AsyncSessionLocal() as db:
+        stmt = select(Borrow.id, Borrow.status).where(Borrow.id.in_(ids))
+        return dict((await db.execute(stmt)).all())
+
+
+async def test_sweep_flags_past_due_borrows_in_batches(client):
+    late = [await _borrow(client) for _ in range(5)]
+    returned, current = await _borrow(client), await _borrow(client)
+    await client.post(f"{API}/borrows/{returned}/return")
+    yesterday = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Borrow)
+            .where(Borrow.id.in_([*late, returned]))
+            .values(due_date=yesterday)
+        )
+        await db.commit()
+
+    sweeper = OverdueSweeper(interval=60, batch_size=2, lock=LeaderLock(engine))
+    assert await sweeper.sweep() == 5
+    assert sweeper.batches == 3  # 2 + 2 + 1: a short batch ends the run
+    statuses = await _statuses([*late, returned, current])
+    assert {statuses[borrow_id] for borrow_id in late} == {"overdue"}
+    assert statuses[returned] == "returned"
+    assert statuses[current] == "active"
+
+    assert await sweeper.sweep() == 0
+    assert sweeper.stats()["transitioned_total"] == 5
+
+
+async def test_only_one_process_leads():
+    name = f"test_sweeper_{uuid.uuid4().hex}"
+    first, second = LeaderLock(engine, name), LeaderLock(engine, name)
+    assert await first.acquire()
+    assert await first.acquire()  # re-entrant for the holder
+    assert not await second.acquire()
+    await first.release()
+    assert await second.acquire()
+    await second.release()
@@ -0,0 +1,79 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal import principal_cache
+
+API = "/api/v1"
+
+
+async def _member(client) -> tuple[dict, dict]:
+    """A new user and the headers that authenticate as them."""
+    name = uuid.uuid4().hex[:12]
+    body = {
+        "username": name,
+        "email": f"{name}@example.com",
+        "full_name": "P",
+        "password": "pw",
+    }
+    user = (await client.post(f"{API}/users/", json=body)).json()
+    login = await client.post(
+        f"{API}/auth/login", json={"username": name, "password": "pw"}
+    )
+    return user, {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+async def test_second_request_is_a_cache_hit(client):
+    user, headers = await _member(client)
+    await client.get(f"{API}/users/me", headers=headers)
+    hits = principal_cache.stats.hits
+    response = await client.get(f"{API}/users/me", headers=headers)
+    assert response.json()["id"] == user["id"]
+    assert principal_cache.stats.hits == hits + 1
+
+
+async def test_role_change_is_seen_on_the_next_request(client):
+    user, headers = await _member(client)
+    before = await client.get(f"{API}/users/me", headers=headers)
+    role = (await client.post(f"{API}/roles/", json={"name": uuid.uuid4().hex})).json()
+    assert before.json()["role"]["id"] != role["id"]
+
+    await client.put(f"{API}/users/{user['id']}", json={"role_id": role["id"]})
+    assert await principal_cache.get(user["id"]) is None
+    after = await client.get(f"{API}/users/me", headers=headers)
+    assert after.json()["role"]["id"] == role["id"]
+
+
+async def test_role_update_drops_cached_principals(client):
+    user, headers = await _member(client)
+    role = (await client.post(f"{API}/roles/", json={"name": uuid.uuid4().hex})).json()
+    await client.put(f"{API}/users/{user['id']}", json={"role_id": role["id"]})
+    await client.get(f"{API}/users/me", headers=headers)
+    assert await principal_cache.get(user["id"]) is not None
+
+    await client.patch(f"{API}/roles/{role['id']}", json={"description": "changed"})
+    assert await principal_cache.get(user["id"]) is None
+
+
+async def test_deactivated_user_is_rejected(client):
+    user, headers = await _member(client)
+    assert (await client.get(f"{API}/users/me", headers=headers)).status_code == 200
+
+    await client.put(f"{API}/users/{user['id']}", json={"is_active": False})
+    response = await client.get(f"{API}/users/me", headers=headers)
+    assert response.status_code == 401
+
+
+async def test_authentication_does_not_commit(client, monkeypatch):
+    _, headers = await _member(client)
+    commits = []
+    commit = AsyncSession.commit
+
+    async def counted(self):
+        commits.append(self)
+        await commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", counted)
+    await principal_cache.backend.clear()  # take the miss path, with its query
+    assert (await client.get(f"{API}/users/me", headers=headers)).status_code == 200
+    assert commits == []
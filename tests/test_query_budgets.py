@@ -0,0 +1,191 @@
+"""Per-endpoint SQL statement budgets.
+
+Each request is measured on its second run, once the principal and
+default-role caches are warm, so the numbers are what steady-state traffic
+pays. Lower a budget when an endpoint gets cheaper; raising one should be a
+deliberate decision in review.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+API = "/api/v1"
+
+# (method, url, json body) with optional request headers as a fourth item.
+Prepared = tuple[Any, ...]
+
+
+@dataclass
+class Case:
+    name: str
+    budget: int
+    # Performs any (uncounted) setup and returns (method, url, json body[, headers]).
+    prepare: Callable[[httpx.AsyncClient], Awaitable[Prepared]]
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(" ".join(statement.split())[:120])
+
+    def reset(self) -> None:
+        self.count = 0
+        self.statements.clear()
+
+
+def _unique() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+async def _create(client: httpx.AsyncClient, path: str, body: dict) -> dict:
+    response = await client.post(f"{API}{path}", json=body)
+    response.raise_for_status()
+    return response.json()
+
+
+def _book_body() -> dict:
+    return {"isbn": _unique(), "title": "Budget", "author": "Check", "total_copies": 3}
+
+
+async def _new_book(client: httpx.AsyncClient) -> dict:
+    return await _create(client, "/books/", _book_body())
+
+
+async def _new_user(client: httpx.AsyncClient) -> dict:
+    name = _unique()
+    return await _create(
+        client,
+        "/users/",
+        {"username": name, "email": f"{name}@example.com", "full_name": "B", "password": "pw"},
+    )
+
+
+async def _register(client):
+    name = _unique()
+    body = {"username": name, "email": f"{name}@example.com", "full_name": "B", "password": "pw"}
+    return "POST", f"{API}/users/", body
+
+
+async def _update_user(client):
+    user = await _new_user(client)
+    return "PUT", f"{API}/users/{user['id']}", {"full_name": "Renamed"}
+
+
+async def _create_book(client):
+    return "POST", f"{API}/books/", _book_body()
+
+
+async def _update_book(client):
+    book = await _new_book(client)
+    return "PATCH", f"{API}/books/{book['id']}", {"title": "Renamed"}
+
+
+async def _delete_book(client):
+    book = await _new_book(client)
+    return "DELETE", f"{API}/books/{book['id']}", None
+
+
+async def _borrow(client):
+    book = await _new_book(client)
+    return "POST", f"{API}/borrows/", {"book_id": book["id"]}
+
+
+async def _return(client):
+    book = await _new_book(client)
+    borrow = await _create(client, "/borrows/", {"book_id": book["id"]})
+    return "POST", f"{API}/borrows/{borrow['id']}/return", None
+
+
+async def _borrow_batch(client):
+    books = [await _new_book(client) for _ in range(3)]
+    return "POST", f"{API}/borrows/batch", {"book_ids": [book["id"] for book in books]}
+
+
+async def _refresh(client):
+    response = await client.post(
+        f"{API}/auth/login", json={"username": "admin", "password": "Admin@1234"}
+    )
+    response.raise_for_status()
+    return "POST", f"{API}/auth/refresh", {"refresh_token": response.json()["refresh_token"]}
+
+
+async def _create_role(client):
+    return "POST", f"{API}/roles/", {"name": f"role-{_unique()}"}
+
+
+async def _create_api_key(client):
+    return "POST", f"{API}/users/me/api-keys", {"name": "budget"}
+
+
+def _get(path: str):
+    async def prepare(client):
+        return "GET", f"{API}{path}", None
+
+    return prepare
+
+
+async def _get_book(client):
+    book = await _new_book(client)
+    return "GET", f"{API}/books/{book['id']}", None
+
+
+async def _revalidate_books(client):
+    response = await client.get(f"{API}/books/")
+    response.raise_for_status()
+    return "GET", f"{API}/books/", None, {"If-None-Match": response.headers["ETag"]}
+
+
+CASES = [
+    Case("POST /users (register)", 2, _register),
+    Case("PUT /users/{id}", 2, _update_user),
+    Case("GET /users", 1, _get("/users/")),
+    Case("GET /users/me", 0, _get("/users/me")),
+    Case("POST /books", 1, _create_book),
+    Case("PATCH /books/{id}", 2, _update_book),
+    Case("DELETE /books/{id}", 3, _delete_book),
+    Case("GET /books", 2, _get("/books/")),
+    Case("GET /books (304)", 1, _revalidate_books),
+    Case("GET /books/{id}", 1, _get_book),
+    Case("POST /borrows", 2, _borrow),
+    Case("POST /borrows/{id}/return", 3, _return),
+    Case("POST /borrows/batch", 3, _borrow_batch),
+    Case("GET /borrows", 1, _get("/borrows/")),
+    Case("POST /roles", 1, _create_role),
+    Case("GET /roles", 1, _get("/roles/")),
+    Case("POST /users/me/api-keys", 1, _create_api_key),
+    Case("POST /auth/refresh", 2, _refresh),
+]
+
+
+@pytest.fixture
+def counter(database):
+    counter = StatementCounter()
+    event.listen(database.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(database.sync_engine, "before_cursor_execute", counter)
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+async def test_statement_budget(client, counter, case):
+    for _ in range(2):
+        method, url, body, *headers = await case.prepare(client)
+        counter.reset()
+        response = await client.request(
+            method, url, json=body, headers=headers[0] if headers else None
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+    statements = "\n".join(counter.statements)
+    assert counter.count <= case.budget, (
+        f"{case.name} sent {counter.count} statements (budget {case.budget}):\n"
+        f"{statements}"
+    )
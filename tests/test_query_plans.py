@@ -0,0 +1,151 @@
+"""Hot queries must be served by an index, not a full table scan.
+
+Each statement is the first one a service function executes, captured by
+calling it with a session that records the statement instead of running
+it. ``EXPLAIN`` then runs on it against the test database, migrated with
+``alembic upgrade head``. On MySQL a query only fails when it is a full scan
+(``type=ALL``) *and* no index could have served it, so small tables that
+the optimizer prefers to scan do not cause false alarms.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+import pytest
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.core.principal import Principal, RolePrincipal
+from app.schemas.book import BookCreate, BookImportResult
+from app.services import (
+    api_key_service,
+    book_service,
+    borrow_service,
+    export_service,
+    import_service,
+    user_service,
+)
+
+NOW = datetime(2026, 1, 1)
+MEMBER = Principal(
+    id=1,
+    username="member",
+    email="member@example.com",
+    full_name="Member",
+    is_active=True,
+    role_id=3,
+    role=RolePrincipal(id=3, name="member", permissions="[]"),
+)
+ISBN = "9780000000000"
+
+
+class _Captured(Exception):
+    pass
+
+
+class RecordingSession:
+    """Stands in for ``AsyncSession``: keeps the first statement and stops."""
+
+    statement: Select | None = None
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statement = statement
+        raise _Captured
+
+    scalar = execute
+
+
+async def first_statement(service: Callable[..., Awaitable[Any]], *args, **kwargs):
+    db = RecordingSession()
+    with pytest.raises(_Captured):
+        await service(db, *args, **kwargs)
+    return db.statement
+
+
+async def _built(statement: Select) -> Select:
+    # For services that hand the statement to a streaming session themselves.
+    return statement
+
+
+def _after(keyset, value) -> str:
+    return encode_cursor(keyset, value, 1)
+
+
+due = borrow_service.borrow_keyset("due_date")
+title = book_service.book_keyset("title")
+users_by_date = user_service.user_keyset("created_at")
+
+# name -> the service call whose first statement is checked.
+HOT_QUERIES: dict[str, Callable[[], Awaitable[Select]]] = {
+    "borrows: member listing": lambda: first_statement(
+        borrow_service.list_borrow_rows, MEMBER
+    ),
+    "borrows: overdue scan": lambda: first_statement(
+        borrow_service.mark_overdue, settings.OVERDUE_SWEEPER_BATCH_SIZE, NOW
+    ),
+    "borrows: member keyset by due_date": lambda: first_statement(
+        borrow_service.list_borrow_rows, MEMBER, after=_after(due, NOW), keyset=due
+    ),
+    "borrows: export date range": lambda: _built(
+        export_service.borrows_query(
+            MEMBER, borrowed_from=NOW - timedelta(days=30), borrowed_to=NOW
+        )
+    ),
+    "books: keyset by title": lambda: first_statement(
+        book_service.list_book_rows, after=_after(title, "M"), keyset=title
+    ),
+    "books: import lookup by isbn": lambda: first_statement(
+        import_service._flush_chunk,
+        {ISBN: (1, BookCreate(isbn=ISBN, title="T", author="A"))},
+        BookImportResult(),
+    ),
+    "books: export by genre": lambda: _built(export_service.books_query("fiction")),
+    "users: by username": lambda: first_statement(
+        user_service.get_user_by_username, "admin"
+    ),
+    "users: keyset by created_at": lambda: first_statement(
+        user_service.get_user_rows,
+        after=_after(users_by_date, NOW),
+        keyset=users_by_date,
+    ),
+    "api_keys: by hash": lambda: first_statement(
+        api_key_service.resolve_api_key, settings.API_KEY_PREFIX + "0" * 64
+    ),
+    "api_keys: of a user": lambda: first_statement(
+        api_key_service.list_user_api_keys, 1
+    ),
+}
+
+
+async def explain(conn: AsyncConnection, stmt: Select) -> tuple[bool, str]:
+    """Return (uses_index, plan summary) for ``stmt``."""
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    if conn.dialect.name == "sqlite":
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        details = [row[-1] for row in result]
+        full_scan = any(
+            d.startswith("SCAN ") and "USING" not in d and "CONSTANT ROW" not in d
+            for d in details
+        )
+        return not full_scan, " | ".join(details)
+
+    result = await conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    rows = [dict(row._mapping) for row in result]
+    full_scan = any(r.get("type") == "ALL" and not r.get("possible_keys") for r in rows)
+    summary = " | ".join(
+        f"{r.get('table')}: type={r.get('type')} key={r.get('key')}" for r in rows
+    )
+    return not full_scan, summary
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+async def test_hot_query_uses_an_index(database, name):
+    statement = await HOT_QUERIES[name]()
+    async with database.connect() as conn:
+        uses_index, plan = await explain(conn, statement)
+    assert uses_index, f"{name} falls back to a full table scan: {plan}"
@@ -0,0 +1,77 @@
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import event
+
+from app.db.session import AsyncSessionLocal
+from app.models import Book
+from app.services import search_service
+from app.services.search_service import InvertedIndexBackend
+
+API = "/api/v1"
+
+
+def _token() -> str:
+    return "t" + uuid.uuid4().hex[:10]
+
+
+async def test_filters_are_checked_in_batches(client, database, monkeypatch):
+    monkeypatch.setattr(search_service, "FILTER_BATCH_SIZE", 2)
+    token, genre = _token(), _token()
+    ids = []
+    for n in range(6):
+        body = {
+            "isbn": uuid.uuid4().hex[:13],
+            "title": f"{token} volume",
+            "author": "S",
+            "genre": genre if n % 2 else "other",
+        }
+        ids.append((await client.post(f"{API}/books/", json=body)).json()["id"])
+    in_genre = ids[1::2]  # equal scores rank by id
+
+    url = f"{API}/books/search"
+    found = await client.get(url, params={"q": token, "genre": genre})
+    assert [book["id"] for book in found.json()] == in_genre
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(database.sync_engine, "before_cursor_execute", listener)
+    try:
+        page = await client.get(url, params={"q": token, "genre": genre, "limit": 1})
+    finally:
+        event.remove(database.sync_engine, "before_cursor_execute", listener)
+    assert [book["id"] for book in page.json()] == in_genre[:1]
+    # One filter batch was enough for the page, then the page itself.
+    assert sum("books.genre = " in statement for statement in statements) == 1
+
+    rest = await client.get(url, params={"q": token, "genre": genre, "skip": 1})
+    assert [book["id"] for book in rest.json()] == in_genre[1:]
+
+
+async def test_changes_committed_during_a_build_are_kept(database):
+    old, new = _token(), _token()
+    async with AsyncSessionLocal() as db:
+        books = [
+            Book(isbn=uuid.uuid4().hex[:13], title=old, author="S") for _ in range(2)
+        ]
+        db.add_all(books)
+        await db.commit()
+    renamed, removed = books
+
+    backend = InvertedIndexBackend()
+    add = backend._add
+
+    def add_while_changing(*args):
+        if not backend._missed:
+            backend.index_book(
+                SimpleNamespace(id=renamed.id, title=new, author="S", description=None)
+            )
+            backend.remove_book(removed.id)
+        add(*args)
+
+    backend._add = add_while_changing
+    async with AsyncSessionLocal() as db:
+        await backend._build(db)
+    assert backend.built
+    assert set(backend.score(new)) == {renamed.id}
+    assert not set(backend.score(old)) & {renamed.id, removed.id}
@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+
+API = "/api/v1"
+
+
+@pytest.fixture
+async def catalog(client):
+    for title in ("Fields C", "Fields A", "Fields B"):
+        body = {"isbn": uuid.uuid4().hex[:13], "title": title, "author": "F"}
+        book = (await client.post(f"{API}/books/", json=body)).json()
+    await client.post(f"{API}/borrows/", json={"book_id": book["id"]})
+
+
+@pytest.mark.parametrize(
+    "path, fields, keys",
+    [
+        ("/books/", "id,title", ["title", "id"]),
+        ("/books/", " isbn , available_copies ", ["isbn", "available_copies"]),
+        ("/users/", "username", ["username"]),
+        ("/users/", "role,id", ["id", "role"]),
+        ("/borrows/", "status,book_id", ["book_id", "status"]),
+    ],
+)
+async def test_only_the_requested_fields_in_schema_order(
+    client, catalog, path, fields, keys
+):
+    response = await client.get(f"{API}{path}", params={"fields": fields})
+    assert response.status_code == 200
+    rows = response.json()
+    assert rows
+    assert all(list(row) == keys for row in rows)
+
+
+async def test_nested_role_is_projected(client):
+    response = await client.get(f"{API}/users/", params={"fields": "username,role"})
+    admin = next(row for row in response.json() if row["username"] == "admin")
+    assert admin["role"]["name"] == "admin"
+
+
+async def test_cursor_still_works_without_the_sort_column(client, catalog):
+    params = {"sort": "title", "fields": "id", "limit": 2}
+    first = await client.get(f"{API}/books/", params=params)
+    after = first.headers["X-Next-Cursor"]
+    second = await client.get(f"{API}/books/", params={**params, "after": after})
+    full = await client.get(f"{API}/books/", params={"sort": "title", "limit": 4})
+    walked = [row["id"] for row in first.json() + second.json()]
+    assert walked == [row["id"] for row in full.json()]
+
+
+@pytest.mark.parametrize("path", ["/books/", "/users/", "/borrows/"])
+@pytest.mark.parametrize("fields", ["title,nope", "hashed_password", "", " , "])
+async def test_unknown_or_empty_fieldset_is_a_400(client, path, fields):
+    response = await client.get(f"{API}{path}", params={"fields": fields})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid fields")
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from jose import jwt
+from sqlalchemy import event
+
+from app.db.session import AsyncSessionLocal
+from app.services.token_revocation import TokenRevocations, token_revocations
+
+API = "/api/v1"
+
+
+async def _login(client) -> dict:
+    response = await client.post(
+        f"{API}/auth/login", json={"username": "admin", "password": "Admin@1234"}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+async def _refresh(client, refresh_token: str):
+    body = {"refresh_token": refresh_token}
+    return await client.post(f"{API}/auth/refresh", json=body)
+
+
+async def test_refresh_rotates_and_rejects_replay(client):
+    tokens = await _login(client)
+    rotated = await _refresh(client, tokens["refresh_token"])
+    assert rotated.status_code == 200
+    pair = rotated.json()
+    assert pair["refresh_token"] != tokens["refresh_token"]
+    me = await client.get(f"{API}/users/me", headers=_bearer(pair))
+    assert me.status_code == 200
+
+    replay = await _refresh(client, tokens["refresh_token"])
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Token revoked"
+    assert (await _refresh(client, pair["refresh_token"])).status_code == 200
+
+
+async def test_concurrent_replay_succeeds_once(client):
+    refresh_token = (await _login(client))["refresh_token"]
+    responses = await asyncio.gather(
+        *(_refresh(client, refresh_token) for _ in range(3))
+    )
+    assert sorted(response.status_code for response in responses) == [200, 401, 401]
+
+
+async def test_access_token_cannot_refresh(client):
+    tokens = await _login(client)
+    assert (await _refresh(client, tokens["access_token"])).status_code == 401
+
+
+async def test_logout_revokes_both_tokens(client):
+    tokens = await _login(client)
+    response = await client.post(
+        f"{API}/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=_bearer(tokens),
+    )
+    assert response.status_code == 204
+
+    me = await client.get(f"{API}/users/me", headers=_bearer(tokens))
+    assert me.status_code == 401
+    assert me.json()["detail"] == "Token revoked"
+    assert (await _refresh(client, tokens["refresh_token"])).status_code == 401
+
+
+@pytest.fixture
+def statements(database):
+    executed = []
+    listener = lambda *args: executed.append(args[2])  # noqa: E731
+    event.listen(database.sync_engine, "before_cursor_execute", listener)
+    yield executed
+    event.remove(database.sync_engine, "before_cursor_execute", listener)
+
+
+async def test_live_tokens_are_cleared_by_the_filter_alone(client, statements):
+    assert token_revocations.loaded
+    tokens = await _login(client)
+    await client.get(f"{API}/users/me", headers=_bearer(tokens))  # warm the caches
+
+    statements.clear()
+    filter_hits = token_revocations.filter_hits
+    me = await client.get(f"{API}/users/me", headers=_bearer(tokens))
+    assert me.status_code == 200
+    assert token_revocations.filter_hits == filter_hits
+    assert not any("revoked_tokens" in statement for statement in statements)
+
+
+async def test_other_workers_pick_up_revocations_on_sync(client):
+    other = TokenRevocations(
+        interval=60, prune_interval=3600, capacity=1000, error_rate=0.01
+    )
+    await other.load()
+    tokens = await _login(client)
+    jti = jwt.get_unverified_claims(tokens["access_token"])["jti"]
+    await client.post(f"{API}/auth/logout", headers=_bearer(tokens))
+
+    async with AsyncSessionLocal() as db:
+        assert await token_revocations.is_revoked(db, jti)
+        # Until it syncs, another worker's filter has not seen the revocation.
+        assert not await other.is_revoked(db, jti)
+        await other.sync()
+        assert await other.is_revoked(db, jti)
@@ -0,0 +1,188 @@
+"""HMACCodec / TokenVerifier: interoperable with python-jose, and as strict."""
+
+import base64
+import time
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from jose import jwt
+
+from app.core import tokens
+from app.core.config import settings
+from app.core.tokens import HMACCodec, TokenVerifier
+
+SECRET = "test-signing-key"
+
+
+@pytest.fixture(autouse=True)
+def hs256(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", SECRET)
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier(max_entries=100, ttl=300)
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _claims(**extra) -> dict:
+    return {"sub": "1", "type": "access", "exp": int(time.time()) + 60, **extra}
+
+
+def _forge(header: dict, claims: dict, signature: str = "") -> str:
+    return f"{_b64(orjson.dumps(header))}.{_b64(orjson.dumps(claims))}.{signature}"
+
+
+@pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+def test_codec_matches_jose_both_ways(algorithm):
+    codec = HMACCodec(SECRET, algorithm)
+    claims = _claims(jti="abc")
+    ours = codec.encode(claims)
+    assert ours == jwt.encode(claims, SECRET, algorithm=algorithm)
+    assert jwt.decode(ours, SECRET, algorithms=[algorithm]) == claims
+    theirs = jwt.encode(claims, SECRET, algorithm=algorithm)
+    assert codec.decode(theirs, time.time()) == claims
+
+
+def test_verifier_falls_back_to_jose_for_other_algorithms(monkeypatch, verifier):
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    token = verifier.encode(_claims())
+    monkeypatch.setattr(settings, "ALGORITHM", "RS256")
+    with pytest.raises(ValueError):
+        verifier.decode(token)
+    assert verifier.stats()["fast_path"] is False
+
+
+def test_rejects_alg_none():
+    codec = HMACCodec(SECRET, "HS256")
+    for alg in ("none", "None", "NONE"):
+        with pytest.raises(ValueError):
+            codec.decode(_forge({"alg": alg, "typ": "JWT"}, _claims()), time.time())
+
+
+def test_rejects_swapped_algorithm():
+    codec = HMACCodec(SECRET, "HS256")
+    claims = _claims()
+    # Validly signed, but with a different HMAC algorithm than configured.
+    with pytest.raises(ValueError):
+        codec.decode(jwt.encode(claims, SECRET, algorithm="HS512"), time.time())
+    # HS256 signature under a header that claims another algorithm.
+    _, payload, _ = codec.encode(claims).split(".")
+    swapped = _b64(orjson.dumps({"alg": "HS512", "typ": "JWT"}))
+    resigned = codec._sign(f"{swapped}.{payload}".encode())
+    with pytest.raises(ValueError):
+        codec.decode(f"{swapped}.{payload}.{resigned.decode()}", time.time())
+
+
+def test_accepts_reordered_header_for_the_same_algorithm():
+    claims = _claims()
+    header = _b64(orjson.dumps({"typ": "JWT", "alg": "HS256"}))
+    payload = _b64(orjson.dumps(claims))
+    codec = HMACCodec(SECRET, "HS256")
+    signature = codec._sign(f"{header}.{payload}".encode()).decode()
+    assert codec.decode(f"{header}.{payload}.{signature}", time.time()) == claims
+
+
+def test_rejects_tampered_signature_and_payload():
+    codec = HMACCodec(SECRET, "HS256")
+    header, payload, signature = codec.encode(_claims()).split(".")
+    flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+    forged_payload = _b64(orjson.dumps(_claims(sub="2")))
+    for token in (
+        f"{header}.{payload}.{flipped}",
+        f"{header}.{forged_payload}.{signature}",
+        f"{header}.{payload}.",
+        f"{header}.{payload}",
+        f"{header}.{payload}.{signature}.{signature}",
+        "not a token",
+    ):
+        with pytest.raises(ValueError):
+            codec.decode(token, time.time())
+
+
+def test_rejects_non_canonical_signature_encoding():
+    codec = HMACCodec(SECRET, "HS256")
+    header, payload, signature = codec.encode(_claims()).split(".")
+    # A 32-byte HMAC leaves two unused bits in the last base64 character;
+    # setting them decodes to the same bytes but is a different token.
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    last = alphabet.index(signature[-1])
+    variant = signature[:-1] + alphabet[last ^ 1]
+    assert base64.urlsafe_b64decode(variant + "=") == base64.urlsafe_b64decode(
+        signature + "="
+    )
+    with pytest.raises(ValueError):
+        codec.decode(f"{header}.{payload}.{variant}", time.time())
+    with pytest.raises(ValueError):
+        codec.decode(f"{header}.{payload}.{signature}=", time.time())
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"exp": 1_000},
+        {"exp": "tomorrow"},
+        {"exp": True},
+        {"nbf": 4_000_000_000},
+        {"nbf": "now"},
+        {"aud": "someone"},
+    ],
+    ids=["exp passed", "exp string", "exp bool", "nbf future", "nbf string", "aud"],
+)
+def test_rejects_time_and_audience_claims_like_jose(claims):
+    codec = HMACCodec(SECRET, "HS256")
+    token = codec.encode({"sub": "1", **claims})
+    with pytest.raises(ValueError):
+        codec.decode(token, time.time())
+    with pytest.raises(Exception):
+        jwt.decode(token, SECRET, algorithms=["HS256"])
+
+
+def test_rejects_non_object_payload():
+    codec = HMACCodec(SECRET, "HS256")
+    header = _b64(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+    payload = _b64(orjson.dumps(["sub", "1"]))
+    signature = codec._sign(f"{header}.{payload}".encode()).decode()
+    with pytest.raises(ValueError):
+        codec.decode(f"{header}.{payload}.{signature}", time.time())
+
+
+def test_cached_claims_expire_at_exp(monkeypatch, verifier):
+    now = time.time()
+    token = verifier.encode(_claims(exp=int(now) + 5))
+    assert verifier.decode(token)["sub"] == "1"
+    assert verifier.decode(token)["sub"] == "1"
+    assert verifier.stats()["entries"] == 1
+
+    monkeypatch.setattr(tokens, "time", SimpleNamespace(time=lambda: now + 10))
+    with pytest.raises(ValueError):
+        verifier.decode(token)
+    assert verifier.stats()["entries"] == 0
+
+
+def test_cached_claims_are_copies(verifier):
+    token = verifier.encode(_claims())
+    verifier.decode(token)["sub"] = "2"
+    assert verifier.decode(token)["sub"] == "1"
+
+
+def test_cache_cleared_when_secret_key_changes(monkeypatch, verifier):
+    token = verifier.encode(_claims())
+    verifier.decode(token)
+    assert verifier.stats()["entries"] == 1
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated-signing-key")
+    with pytest.raises(ValueError):
+        verifier.decode(token)
+    assert verifier.stats()["entries"] == 0
+
+
+def test_uncached_decode_skips_the_cache(verifier):
+    token = verifier.encode(_claims())
+    verifier.decode(token, cache=False)
+    assert verifier.stats()["entries"] == 0